@@ -116,16 +116,14 @@ def generate_detection_status_analysis(df_list, month_names=None):
         work_df['SeverityName'] = work_df['SeverityName'].map(severity_mapping).fillna(work_df['SeverityName'])
 
         # 1. Create Pivot Table: Status x Severity with Request IDs as columns
-        pivot_by_request = pd.pivot_table(
-            work_df,
-            values='RequestID',
-            index='Status',
-            columns='SeverityName',
-            aggfunc='count',
-            fill_value=0
+        # (one groupby count reshaped in place; pivot_table adds its own reindexing passes on top)
+        pivot_by_request = (
+            work_df.groupby(['Status', 'SeverityName'])['RequestID']
+            .count()
+            .unstack('SeverityName', fill_value=0)
         )
 
-        # Add Grand Total column and row
+        # Add Grand Total column and row from the small pivot's own sums
         pivot_by_request['Grand Total'] = pivot_by_request.sum(axis=1)
         pivot_by_request.loc['Grand Total'] = pivot_by_request.sum(axis=0)
 
@@ -1271,7 +1271,10 @@ def pivot_table_builder_dashboard():
 
         # Show data preview
         with st.expander("📋 Data Preview", expanded=False):
-            st.dataframe(filtered_df.head(20), use_container_width=True)
+            preview_df = filtered_df.head(20)
+            if selected_analysis_key in TIME_PERCENTAGE_KEYS:
+                preview_df = format_percentage_column(preview_df)
+            st.dataframe(preview_df, use_container_width=True)
 
         return
 
@@ -1282,10 +1285,13 @@ def pivot_table_builder_dashboard():
         if pivot_table is not None and not pivot_table.empty:
             # Display pivot table
             st.subheader("📊 Pivot Table")
-            st.dataframe(pivot_table, use_container_width=True)
+            display_pivot = pivot_table
+            if selected_analysis_key in TIME_PERCENTAGE_KEYS and config['aggregation'] != 'count':
+                display_pivot = format_percentage_column(pivot_table)
+            st.dataframe(display_pivot, use_container_width=True)
 
             # Download pivot table as CSV
-            csv = pivot_table.to_csv()
+            csv = display_pivot.to_csv()
             st.download_button(
                 label="📥 Download Pivot Table (CSV)",
                 data=csv,
@@ -1449,6 +1455,19 @@ def pivot_table_builder_dashboard():
         st.info("💡 Tip: Make sure your field selections are compatible with the aggregation function chosen.")
 
 
+# Time analyses whose Percentage column is stored as a number and shown with a '%' suffix
+TIME_PERCENTAGE_KEYS = ('hourly_analysis', 'day_of_week')
+
+
+def format_percentage_column(df):
+    """Return a copy of df with a numeric Percentage column shown as '12.5%' strings"""
+    if 'Percentage' not in df.columns or not pd.api.types.is_numeric_dtype(df['Percentage']):
+        return df
+    formatted = df.copy()
+    formatted['Percentage'] = formatted['Percentage'].round(1).astype(str) + '%'
+    return formatted
+
+
 def create_pivot_table(df, config, selected_analysis_key=None):
     """Create pivot table based on configuration"""
     rows = config['rows']
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+
+from ticket_lifecycle_generator import generate_ticket_lifecycle_analysis
+
+# Run the analysis itself, not the st.cache_data wrapper
+analyse = getattr(generate_ticket_lifecycle_analysis, '__wrapped__', generate_ticket_lifecycle_analysis)
+
+
+def test_month_with_only_null_request_ids_gets_empty_chart():
+    ticket_df = pd.DataFrame({
+        'Period': ['Oct 2025', 'Nov 2025'],
+        'Status': ['closed', 'closed'],
+        'SeverityName': ['Low', 'Low'],
+        'Request ID': [1, np.nan]
+    })
+
+    results = analyse(ticket_df, 2)
+
+    assert results['chart_data_Oct_2025']['Count'].tolist() == [1]
+    chart_nov = results['chart_data_Nov_2025']
+    assert chart_nov.empty
+    assert chart_nov.columns.tolist() == ['Request ID', 'Status', 'SeverityName', 'Count']
+    # The ticket without a Request ID is still listed in the pivot, with zero counts
+    pivot_nov = results['request_severity_pivot_Nov_2025']
+    assert len(pivot_nov) == 1
+    assert pivot_nov[['Critical', 'High', 'Medium', 'Low']].to_numpy().sum() == 0
+    assert results['ticket_summary_Nov_2025']['total_alerts'] == 0
+
+
+def test_chart_rows_sorted_by_raw_values():
+    ticket_df = pd.DataFrame({
+        'Period': ['Oct 2025'] * 3,
+        'Status': ['closed'] * 3,
+        'SeverityName': ['Medium', 'Low', 'Critical'],
+        'Request ID': [7, 7, 7]
+    })
+
+    chart = analyse(ticket_df, 1)['chart_data_Oct_2025']
+
+    assert chart['SeverityName'].tolist() == ['Critical', 'Low', 'Medium']
+
+
+def test_count_column_expansion_with_duplicate_index_and_negative_count():
+    ticket_df = pd.DataFrame({
+        'Period': ['Oct 2025'] * 3,
+        'Status': ['closed', 'open', 'open'],
+        'SeverityName': ['High', 'Low', 'Critical'],
+        'Request ID': [1, 2, 3],
+        'Count of SeverityName': [2, 3, -1]
+    }, index=[0, 0, 1])
+
+    results = analyse(ticket_df, 1)
+
+    pivot = results['request_severity_pivot_Oct_2025']
+    assert pivot['Request ID'].tolist() == [1, 2]
+    assert pivot['High'].tolist() == [2, 0]
+    assert pivot['Low'].tolist() == [0, 3]
+    assert results['ticket_summary_Oct_2025']['total_alerts'] == 5
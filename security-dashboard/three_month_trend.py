@@ -653,12 +653,10 @@ April	Data Exfiltration	20	Malware	18	Malware	28	Ransomware	1""",
             if st.session_state.executive_summary_trend.strip():
                 # Convert bullet points to HTML list
                 summary_lines = st.session_state.executive_summary_trend.strip().split('\n')
-                summary_html = "<ul class='summary-bullet'>"
-                for line in summary_lines:
-                    if line.strip():
-                        clean_line = line.strip().lstrip('• ')
-                        summary_html += f"<li>{clean_line}</li>"
-                summary_html += "</ul>"
+                summary_parts = ["<ul class='summary-bullet'>"]
+                summary_parts.extend(f"<li>{line.strip().lstrip('• ')}</li>" for line in summary_lines if line.strip())
+                summary_parts.append("</ul>")
+                summary_html = ''.join(summary_parts)
                 
                 # Display the summary
                 st.markdown(f"<div class='insight-card'>{summary_html}</div>", unsafe_allow_html=True)
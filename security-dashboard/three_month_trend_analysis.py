@@ -1,8 +1,8 @@
+import io
 import streamlit as st
 import pandas as pd
 import numpy as np
 from streamlit_echarts import st_echarts
-import matplotlib.pyplot as plt
 
 def convert_to_json_serializable(obj):
     if isinstance(obj, (np.int64, np.int32, np.int16, np.int8)):
@@ -70,6 +70,158 @@ def create_base_chart_options(title=None, x_label=None, y_label=None):
         options["yAxis"] = {"name": y_label}
     return options
 
+# Export format of 'Detect MALAYSIA TIME FORMULA' (e.g. 31/07/2025 09:12:52)
+DETECT_TIME_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+# Helper function to parse detection times once: pinned format first, day-first fallback for the rest
+def parse_detect_time(series):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    parsed = pd.to_datetime(series, format=DETECT_TIME_FORMAT, errors='coerce')
+    unparsed = parsed.isna() & series.notna()
+    if unparsed.any():
+        parsed[unparsed] = pd.to_datetime(series[unparsed], dayfirst=True, errors='coerce')
+    return parsed
+
+# Helper function to add Hour/Day_of_Week/Day_Name once per dataset instead of on every rerun
+@st.cache_data
+def enrich_time_features(df):
+    df = df.copy()
+    df['Detect MALAYSIA TIME FORMULA'] = parse_detect_time(df['Detect MALAYSIA TIME FORMULA'])
+    detect_time = df['Detect MALAYSIA TIME FORMULA']
+    df['Hour'] = detect_time.dt.hour
+    df['Day_of_Week'] = detect_time.dt.dayofweek
+    df['Day_Name'] = detect_time.dt.day_name()
+    return df
+
+# Helper function to aggregate the Time Analysis charts once per dataset; chart options are
+# then built from these small tables, so widget-triggered reruns skip the groupbys entirely
+@st.cache_data
+def summarize_time_patterns(df):
+    is_business_hours = df['Hour'].between(9, 16)  # 9 AM to 5 PM
+    business_pct = is_business_hours.groupby(df['Period'], sort=False).mean().mul(100)
+    monthly_time_dist = pd.DataFrame({
+        'Period': business_pct.index,
+        'Business_Hours_Pct': business_pct.to_numpy(),
+        'After_Hours_Pct': 100 - business_pct.to_numpy()
+    })
+    # One Period x Hour / Period x Day_of_Week count matrix; each series is a row lookup
+    hourly_pivot = (
+        df.groupby(['Period', 'Hour']).size()
+        .unstack(fill_value=0)
+        .reindex(columns=range(24), fill_value=0)
+    )
+    dow_pivot = (
+        df.groupby(['Period', 'Day_of_Week']).size()
+        .unstack(fill_value=0)
+        .reindex(index=hourly_pivot.index, columns=range(7), fill_value=0)
+    )
+    return monthly_time_dist, hourly_pivot, dow_pivot
+
+# Helper function to find the host with the most detections in a single counting pass
+def get_top_host(df):
+    if df.empty or 'Hostname' not in df.columns:
+        return '', 0
+    # Sorted by host name so a tie goes to the first name, as groupby('Hostname').size().idxmax() did
+    host_sizes = df['Hostname'].value_counts(sort=False).sort_index()
+    if host_sizes.empty:
+        return '', 0
+    top_idx = int(host_sizes.to_numpy().argmax())
+    return host_sizes.index[top_idx], int(host_sizes.iat[top_idx])
+
+# Helper function to redraw a stored ECharts option dict as a Matplotlib figure for the PDF export;
+# covers the bar/line/pie charts used here and returns None for anything else (e.g. heatmaps)
+def echarts_options_to_figure(options):
+    from matplotlib.figure import Figure
+
+    def series_values(data):
+        return [item.get('value', 0) if isinstance(item, dict) else item for item in data]
+
+    def first_axis(axis):
+        return (axis[0] if axis else {}) if isinstance(axis, list) else (axis or {})
+
+    series_list = options.get('series', [])
+    if isinstance(series_list, dict):
+        series_list = [series_list]
+    if not series_list:
+        return None
+
+    # Series may read their values from a shared dataset via 'encode' instead of carrying 'data'
+    dataset = options.get('dataset', {})
+    source = dataset.get('source', []) if isinstance(dataset, dict) else []
+    header, rows = (source[0], source[1:]) if source else ([], [])
+
+    def dataset_column(name):
+        return [row[header.index(name)] for row in rows] if name in header else []
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot(111)
+    title = options.get('title', {})
+    ax.set_title(title.get('text', '') if isinstance(title, dict) else '')
+
+    if all(series.get('type') == 'pie' for series in series_list):
+        data = series_list[0].get('data', [])
+        ax.pie(series_values(data), labels=[item.get('name', '') if isinstance(item, dict) else '' for item in data],
+               autopct='%1.1f%%')
+        ax.axis('equal')
+        return fig
+
+    if any(series.get('type') not in ('bar', 'line') for series in series_list):
+        return None
+
+    # Horizontal bar charts put the categories on the y-axis
+    x_axis, y_axis = first_axis(options.get('xAxis')), first_axis(options.get('yAxis'))
+    horizontal = y_axis.get('type') == 'category'
+    category_dim, value_dim = ('y', 'x') if horizontal else ('x', 'y')
+    categories = (y_axis if horizontal else x_axis).get('data') or dataset_column(series_list[0].get('encode', {}).get(category_dim))
+    secondary_ax = None
+
+    # Side-by-side bars unless the series share an ECharts stack
+    bar_series = [series for series in series_list if series.get('type') == 'bar']
+    bar_groups = list(dict.fromkeys(series.get('stack', id(series)) for series in bar_series))
+    bar_width = 0.8 / max(len(bar_groups), 1)
+    stack_bases = {}
+
+    for series in series_list:
+        data = series['data'] if 'data' in series else dataset_column(series.get('encode', {}).get(value_dim))
+        values = np.asarray(series_values(data), dtype=float)
+        positions = np.arange(len(values))
+        label = series.get('name')
+        target_ax = ax
+        if series.get('yAxisIndex', 0) == 1:
+            secondary_ax = secondary_ax or ax.twinx()
+            target_ax = secondary_ax
+
+        if series.get('type') == 'bar':
+            group = series.get('stack', id(series))
+            offset = (bar_groups.index(group) - (len(bar_groups) - 1) / 2) * bar_width
+            base = stack_bases.get(group)
+            if base is None or len(base) != len(values):
+                base = np.zeros(len(values))
+            if horizontal:
+                target_ax.barh(positions + offset, values, height=bar_width, left=base, label=label)
+            else:
+                target_ax.bar(positions + offset, values, width=bar_width, bottom=base, label=label)
+            stack_bases[group] = base + values
+        elif horizontal:
+            target_ax.plot(values, positions, marker='o', label=label)
+        else:
+            target_ax.plot(positions, values, marker='o', label=label)
+
+    if categories:
+        if horizontal:
+            ax.set_yticks(range(len(categories)))
+            ax.set_yticklabels([str(c) for c in categories])
+        else:
+            ax.set_xticks(range(len(categories)))
+            ax.set_xticklabels([str(c) for c in categories], rotation=45, ha='right')
+    ax.set_xlabel(x_axis.get('name', ''))
+    ax.set_ylabel(y_axis.get('name', ''))
+    if len(series_list) > 1 and any(series.get('name') for series in series_list):
+        fig.legend(loc='lower center', ncol=min(len(series_list), 4))
+    fig.tight_layout()
+    return fig
+
 def three_month_trend_analysis_dashboard():
     st.title("📈 Three-Month Trend Analysis Dashboard")
     st.markdown("""
@@ -164,6 +316,9 @@ def three_month_trend_analysis_dashboard():
     # Store figures for PDF export
     figures = []
 
+    # Base chart options shared by every chart below
+    theme = get_theme_options()
+
     # ========== HOST SECURITY ANALYSIS (A.1-A.4) ==========
     if template == "Host Analysis" and analysis_type == "Host Security Analysis":
         st.markdown('<div class="pdf-section">', unsafe_allow_html=True)
@@ -176,8 +331,7 @@ def three_month_trend_analysis_dashboard():
         if 'Period' in df.columns and 'Hostname' in df.columns:
             # Calculate metrics for each period
             overview_data = []
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
+            for period, period_df in df.groupby('Period', sort=False):
                 total_detections = len(period_df)
                 total_hosts = period_df['Hostname'].nunique()
                 unique_users = period_df['UserName'].nunique() if 'UserName' in period_df.columns else 0
@@ -204,7 +358,7 @@ def three_month_trend_analysis_dashboard():
             avg_detections = overview_df['Avg_Detections_per_Host'].tolist()
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Host Overview Detection Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {
@@ -270,12 +424,11 @@ def three_month_trend_analysis_dashboard():
 
         if 'Hostname' in df.columns and 'Period' in df.columns:
             # Create horizontal bar chart for each period
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
+            for period, period_df in df.groupby('Period', sort=False):
                 host_counts = period_df.groupby('Hostname').size().reset_index(name='Count').sort_values('Count', ascending=False).head(5)
 
                 options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": f"Top Hosts with Most Detections Across Three Months Trends - Top 5"},
                     "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                     "xAxis": {"type": "value", "name": "Number of Detections"},
@@ -306,13 +459,12 @@ def three_month_trend_analysis_dashboard():
 
         if 'UserName' in df.columns and 'Period' in df.columns:
             # Create horizontal bar chart for each period
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
+            for period, period_df in df.groupby('Period', sort=False):
                 filtered_df = period_df[period_df['UserName'].str.strip() != '']
                 user_counts = filtered_df.groupby('UserName').size().reset_index(name='Count').sort_values('Count', ascending=False).head(5)
 
                 options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": f"Users with Most Detections Across Three Months Trends - Top 5"},
                     "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                     "xAxis": {"type": "value", "name": "Number of Detections"},
@@ -349,7 +501,7 @@ def three_month_trend_analysis_dashboard():
             outdated_count = sensor_counts[~sensor_counts['Sensor Version'].str.contains('Latest', case=False, na=False)]['Count'].sum() if not sensor_counts.empty else 0
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detections Hosts with Sensor Versions Status Across Three Months"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "xAxis": {
@@ -387,8 +539,7 @@ def three_month_trend_analysis_dashboard():
         if 'SeverityName' in df.columns and 'Period' in df.columns:
             # Calculate critical and high detections for each period
             critical_high_data = []
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
+            for period, period_df in df.groupby('Period', sort=False):
                 critical_count = (period_df['SeverityName'] == 'Critical').sum()
                 high_count = (period_df['SeverityName'] == 'High').sum()
                 critical_high_data.append({
@@ -438,7 +589,7 @@ def three_month_trend_analysis_dashboard():
             severity_data = {col: [int(x) for x in severity_trend[col]] for col in severity_trend.columns}
             
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detection Count by Severity Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": [str(col) for col in severity_trend.columns]},
@@ -471,7 +622,7 @@ def three_month_trend_analysis_dashboard():
             country_trend = df.groupby(['Period', 'Country']).size().unstack(fill_value=0)
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detection Count by Country Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": country_trend.columns.tolist()},
@@ -505,7 +656,7 @@ def three_month_trend_analysis_dashboard():
             file_counts.columns = ['FileName', 'Count']
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "File Name with Most Detections Across Three Months Trends - Top 5"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "xAxis": {"type": "value", "name": "Number of Detections"},
@@ -545,7 +696,7 @@ def three_month_trend_analysis_dashboard():
             pivot_data = tactic_severity_trend.pivot(index='Period', columns='Tactic', values='Count').fillna(0)
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Tactics by Severity Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": top_tactics},
@@ -581,7 +732,7 @@ def three_month_trend_analysis_dashboard():
             top_techniques = df.groupby('Technique').size().nlargest(5).index.tolist()
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Technique by Severity Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": top_techniques},
@@ -617,17 +768,17 @@ def three_month_trend_analysis_dashboard():
         st.markdown("### C.1 Daily Detection Trend (3 Months Trend)")
 
         if 'Detect MALAYSIA TIME FORMULA' in df.columns:
-            df['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(df['Detect MALAYSIA TIME FORMULA'], dayfirst=True, errors='coerce')
-            daily_counts = df.groupby(df['Detect MALAYSIA TIME FORMULA'].dt.date).size().reset_index(name='Count')
-            daily_counts = daily_counts.sort_values('Detect MALAYSIA TIME FORMULA')
+            df['Detect MALAYSIA TIME FORMULA'] = parse_detect_time(df['Detect MALAYSIA TIME FORMULA'])
+            # Group on datetime64 day keys; groupby already returns them in date order
+            daily_counts = df.groupby(df['Detect MALAYSIA TIME FORMULA'].dt.floor('D')).size().reset_index(name='Count')
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detection Over Multiple Days Across Three Months Trends - Top 3"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "cross"}},
                 "xAxis": {
                     "type": "category",
-                    "data": [d.strftime('%d/%m/%Y') for d in daily_counts['Detect MALAYSIA TIME FORMULA']],
+                    "data": daily_counts['Detect MALAYSIA TIME FORMULA'].dt.strftime('%d/%m/%Y').tolist(),
                     "axisLabel": {"rotate": 45}
                 },
                 "yAxis": {"type": "value", "name": "Number of Detections"},
@@ -649,12 +800,12 @@ def three_month_trend_analysis_dashboard():
         st.markdown("### C.2 Hourly Distribution of Detections (3 Months Trend)")
 
         if 'Detect MALAYSIA TIME FORMULA' in df.columns:
-            df['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(df['Detect MALAYSIA TIME FORMULA'], dayfirst=True, errors='coerce')
+            df['Detect MALAYSIA TIME FORMULA'] = parse_detect_time(df['Detect MALAYSIA TIME FORMULA'])
             df['Hour'] = df['Detect MALAYSIA TIME FORMULA'].dt.hour
             hourly_counts = df.groupby('Hour').size().reset_index(name='Count')
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Hourly Distribution of Detections Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "cross"}},
                 "xAxis": {
@@ -683,7 +834,7 @@ def three_month_trend_analysis_dashboard():
         st.markdown("### C.3 Day of Weeks Frequency Detections (3 Months Trend)")
 
         if 'Detect MALAYSIA TIME FORMULA' in df.columns:
-            df['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(df['Detect MALAYSIA TIME FORMULA'], dayfirst=True, errors='coerce')
+            df['Detect MALAYSIA TIME FORMULA'] = parse_detect_time(df['Detect MALAYSIA TIME FORMULA'])
             df['Day_of_Week'] = df['Detect MALAYSIA TIME FORMULA'].dt.day_name()
             weekly_counts = df.groupby('Day_of_Week').size().reset_index(name='Count')
 
@@ -693,7 +844,7 @@ def three_month_trend_analysis_dashboard():
             weekly_counts = weekly_counts.sort_values('Day_of_Week')
 
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detection Frequency by Day of Week Across Three Months Trends"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "xAxis": {
@@ -720,28 +871,30 @@ def three_month_trend_analysis_dashboard():
     if export_pdf and figures:
         try:
             from matplotlib.backends.backend_pdf import PdfPages
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmpfile:
-                pdf_path = tmpfile.name
-                with PdfPages(pdf_path) as pdf:
-                    for fig in figures:
+            # Build the PDF in memory; download_button takes the bytes directly
+            pdf_buffer = io.BytesIO()
+            with PdfPages(pdf_buffer) as pdf:
+                # figures holds ECharts option dicts; redraw each one with Matplotlib only now
+                for chart_options in figures:
+                    fig = echarts_options_to_figure(chart_options)
+                    if fig is not None:
                         pdf.savefig(fig, bbox_inches='tight')
-                with open(pdf_path, 'rb') as f:
-                    st.download_button(
-                        label="Download All Visuals as PDF",
-                        data=f.read(),
-                        file_name="three_month_trend_visuals.pdf",
-                        mime="application/pdf"
-                    )
+            st.download_button(
+                label="Download All Visuals as PDF",
+                data=pdf_buffer.getvalue(),
+                file_name="three_month_trend_visuals.pdf",
+                mime="application/pdf",
+                key="three_month_pdf_download_sections"
+            )
             st.success("PDF generated! Download using the button above.")
-            # Clean up temp file
-            os.remove(pdf_path)
         except Exception as e:
             st.error(f"PDF export failed: {e}")
 
     st.info("You can further extend this dashboard to add more trend visualizations as needed.")
 
+    # Periods in order of appearance, shared by every per-month tab set below
+    period_list = df['Period'].unique().tolist() if 'Period' in df.columns else []
+
     # ========== Detection Analysis Visualizations ==========
     if template == "Detection Analysis":
         st.header("Detections per File (Month)")
@@ -752,7 +905,7 @@ def three_month_trend_analysis_dashboard():
             month_labels = [str(x) for x in det_per_month['Month_Index']]
             
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detections per File (Month)"},
                 "xAxis": {
                     "type": "category",
@@ -807,7 +960,7 @@ def three_month_trend_analysis_dashboard():
                     "data": data_points
                 })
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detections by Severity per File (Month)"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": severity_levels, "selectedMode": "multiple"},
@@ -839,7 +992,7 @@ def three_month_trend_analysis_dashboard():
             
             # Create pie chart for severity distribution
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Overall Severity Distribution"},
                 "tooltip": {
                     "trigger": "item",
@@ -881,7 +1034,7 @@ def three_month_trend_analysis_dashboard():
             
             # Create trend visualization
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detection Count and Growth Trend"},
                 "tooltip": {
                     "trigger": "axis",
@@ -967,7 +1120,7 @@ def three_month_trend_analysis_dashboard():
                 
                 # Create stacked area chart
                 options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Severity Distribution Trend"},
                     "tooltip": {
                         "trigger": "axis",
@@ -1010,7 +1163,7 @@ def three_month_trend_analysis_dashboard():
                 top_objectives = objective_trend.sum().nlargest(5).index.tolist()
                 
                 options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Top 5 Detection Categories Over Time"},
                     "tooltip": {
                         "trigger": "axis",
@@ -1092,19 +1245,24 @@ def three_month_trend_analysis_dashboard():
         if 'Objective' in df.columns and 'Period' in df.columns:
             st.header(f"Top {top_n} Objectives per Month")
             obj_trend = df.groupby(['Period', 'Objective']).size().reset_index(name='Count')
+            # Slice each period's top N once so the tabs below only render
+            obj_top = {p: g.nlargest(top_n, 'Count') for p, g in obj_trend.groupby('Period', sort=False)}
             
-            periods = df['Period'].unique().tolist()
+            periods = period_list
             
             # Create tabs for each period using Streamlit tabs
             tabs = st.tabs(periods)
             
             for tab, period in zip(tabs, periods):
                 with tab:
-                    period_df = obj_trend[obj_trend['Period'] == period].sort_values('Count', ascending=False).head(top_n)
+                    period_df = obj_top.get(period, obj_trend.iloc[:0])
+                    if period_df.empty:
+                        st.info(f"No objective data for {period}")
+                        continue
                     
                     # Create ECharts options for horizontal bar chart
                     options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Top {top_n} Objectives"},
                         "tooltip": {
                             "trigger": "axis",
@@ -1146,6 +1304,8 @@ def three_month_trend_analysis_dashboard():
         if 'Country' in df.columns and 'Period' in df.columns:
             st.header(f"Top {top_n} Countries Comparison Across Months")
             country_trend = df.groupby(['Period', 'Country']).size().reset_index(name='Count')
+            # Slice each period's top N once so the tabs below only render
+            country_top = {p: g.nlargest(top_n, 'Count') for p, g in country_trend.groupby('Period', sort=False)}
             
             # Get the overall top N countries
             top_countries = df.groupby('Country')['Period'].count().nlargest(top_n).index.tolist()
@@ -1156,7 +1316,7 @@ def three_month_trend_analysis_dashboard():
             
             # Create side-by-side bar chart
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": f"Top {top_n} Countries Detection Trend"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": top_countries, "top": 25},
@@ -1192,14 +1352,17 @@ def three_month_trend_analysis_dashboard():
             st.dataframe(summary_df, use_container_width=True)
             tabs = []
             # Create tabs container for each period
-            period_tabs = st.tabs(list(df['Period'].unique()))
-            for period, tab in zip(df['Period'].unique(), period_tabs):
+            period_tabs = st.tabs(period_list)
+            for period, tab in zip(period_list, period_tabs):
                 with tab:
-                    period_df = country_trend[country_trend['Period'] == period].sort_values('Count', ascending=False).head(top_n)
+                    period_df = country_top.get(period, country_trend.iloc[:0])
+                    if period_df.empty:
+                        st.info(f"No country data for {period}")
+                        continue
                     
                     # Create bar chart options
                     bar_options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Top {top_n} Countries"},
                         "tooltip": {
                             "trigger": "axis",
@@ -1251,6 +1414,8 @@ def three_month_trend_analysis_dashboard():
         if 'FileName' in df.columns and 'Period' in df.columns:
             st.header(f"Top {top_n} Files with Most Detections")
             file_trend = df.groupby(['Period', 'FileName']).size().reset_index(name='Count')
+            # Slice each period's top N once so the tabs below only render
+            file_top = {p: g.nlargest(top_n, 'Count') for p, g in file_trend.groupby('Period', sort=False)}
             
             # Get the overall top N files
             top_files = df.groupby('FileName')['Period'].count().nlargest(top_n).index.tolist()
@@ -1261,7 +1426,7 @@ def three_month_trend_analysis_dashboard():
             
             # Create side-by-side bar chart
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": f"Top {top_n} Files Detection Trend"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {
@@ -1299,13 +1464,16 @@ def three_month_trend_analysis_dashboard():
                 'Percentage': (file_summary.values / file_summary.sum() * 100).round(2)
             })
             st.dataframe(summary_df, use_container_width=True)
-            for period, tab in zip(df['Period'].unique(), period_tabs):
+            for period, tab in zip(period_list, period_tabs):
                 with tab:
-                    period_df = file_trend[file_trend['Period'] == period].sort_values('Count', ascending=False).head(top_n)
+                    period_df = file_top.get(period, file_trend.iloc[:0])
+                    if period_df.empty:
+                        st.info(f"No file data for {period}")
+                        continue
                     
                     # Create bar chart options
                     bar_options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Top {top_n} Files"},
                         "tooltip": {
                             "trigger": "axis",
@@ -1359,19 +1527,24 @@ def three_month_trend_analysis_dashboard():
         if 'Tactic' in df.columns and 'Period' in df.columns:
             st.header(f"Top {top_n} Tactics per Month")
             tactic_trend = df.groupby(['Period', 'Tactic']).size().reset_index(name='Count')
+            # Slice each period's top N once so the tabs below only render
+            tactic_top = {p: g.nlargest(top_n, 'Count') for p, g in tactic_trend.groupby('Period', sort=False)}
             
-            periods = df['Period'].unique().tolist()
+            periods = period_list
             
             # Create tabs for each period using Streamlit tabs
             tabs = st.tabs(periods)
             
             for tab, period in zip(tabs, periods):
                 with tab:
-                    period_df = tactic_trend[tactic_trend['Period'] == period].sort_values('Count', ascending=False).head(top_n)
+                    period_df = tactic_top.get(period, tactic_trend.iloc[:0])
+                    if period_df.empty:
+                        st.info(f"No tactic data for {period}")
+                        continue
                     
                     # Create ECharts options for bar chart
                     options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Top {top_n} Tactics"},
                         "tooltip": {
                             "trigger": "axis",
@@ -1413,16 +1586,21 @@ def three_month_trend_analysis_dashboard():
         if 'Technique' in df.columns and 'Period' in df.columns:
             st.header(f"Top {top_n} Techniques per Month")
             tech_trend = df.groupby(['Period', 'Technique']).size().reset_index(name='Count')
+            # Slice each period's top N once so the tabs below only render
+            tech_top = {p: g.nlargest(top_n, 'Count') for p, g in tech_trend.groupby('Period', sort=False)}
             
             # Create tabs container for each period
-            period_tabs = st.tabs(list(df['Period'].unique()))
-            for period, tab in zip(df['Period'].unique(), period_tabs):
+            period_tabs = st.tabs(period_list)
+            for period, tab in zip(period_list, period_tabs):
                 with tab:
-                    period_df = tech_trend[tech_trend['Period'] == period].sort_values('Count', ascending=False).head(top_n)
+                    period_df = tech_top.get(period, tech_trend.iloc[:0])
+                    if period_df.empty:
+                        st.info(f"No technique data for {period}")
+                        continue
                     
                     # Create bar chart options
                     bar_options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Top {top_n} Techniques"},
                         "tooltip": {
                             "trigger": "axis",
@@ -1475,16 +1653,21 @@ def three_month_trend_analysis_dashboard():
         if 'Resolution' in df.columns and 'Period' in df.columns:
             st.header(f"Top {top_n} Resolutions per Month")
             res_trend = df.groupby(['Period', 'Resolution']).size().reset_index(name='Count')
+            # Slice each period's top N once so the tabs below only render
+            res_top = {p: g.nlargest(top_n, 'Count') for p, g in res_trend.groupby('Period', sort=False)}
             
             # Create tabs container for each period
-            period_tabs = st.tabs(list(df['Period'].unique()))
-            for period, tab in zip(df['Period'].unique(), period_tabs):
+            period_tabs = st.tabs(period_list)
+            for period, tab in zip(period_list, period_tabs):
                 with tab:
-                    period_df = res_trend[res_trend['Period'] == period].sort_values('Count', ascending=False).head(top_n)
+                    period_df = res_top.get(period, res_trend.iloc[:0])
+                    if period_df.empty:
+                        st.info(f"No resolution data for {period}")
+                        continue
                     
                     # Create bar chart options
                     bar_options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Top {top_n} Resolutions"},
                         "tooltip": {
                             "trigger": "axis",
@@ -1540,10 +1723,15 @@ def three_month_trend_analysis_dashboard():
         if 'Detect MALAYSIA TIME FORMULA' in df.columns:
             df['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(df['Detect MALAYSIA TIME FORMULA'], errors='coerce')
 
+        # Group the low-cardinality text columns on category codes rather than hashing strings
+        # (astype returns a new frame, so the session-state data is left untouched)
+        category_cols = ['Hostname', 'UserName', 'Platform', 'OS Version', 'Sensor Version']
+        df = df.astype({col: 'category' for col in category_cols if col in df.columns})
+
         # Overview metrics (aggregate)
         total_hosts = df['Hostname'].nunique() if 'Hostname' in df.columns else 0
         total_detections = len(df)
-        windows_hosts = df[df['OS Version'].str.contains('Windows', na=False)]['Hostname'].nunique() if 'OS Version' in df.columns else 0
+        windows_hosts = df.loc[df['OS Version'].str.contains('Windows', na=False, regex=False), 'Hostname'].nunique() if 'OS Version' in df.columns else 0
         avg_detections = round(total_detections / total_hosts, 2) if total_hosts > 0 else 0
         st.subheader("Aggregate Metrics (All Months)")
         col1, col2, col3, col4 = st.columns(4)
@@ -1552,13 +1740,16 @@ def three_month_trend_analysis_dashboard():
         col3.metric("Windows Hosts", windows_hosts)
         col4.metric("Avg. Detections/Host", avg_detections)
 
+        # Split the data by period once; both monthly trend charts reuse the same grouping
+        period_groups = df.groupby('Period') if 'Period' in df.columns else None
+
         # Trend: Unique Hosts per Month
-        if 'Period' in df.columns and 'Hostname' in df.columns:
-            hosts_per_month = df.groupby('Period')['Hostname'].nunique().reset_index(name='Unique Hosts')
+        if period_groups is not None and 'Hostname' in df.columns:
+            hosts_per_month = period_groups['Hostname'].nunique().reset_index(name='Unique Hosts')
             
             # Create ECharts options for line chart
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Unique Hosts per Month"},
                 "tooltip": {
                     "trigger": "axis",
@@ -1600,12 +1791,12 @@ def three_month_trend_analysis_dashboard():
             figures.append(options)  # Store for PDF export
 
             # Trend: Detections per Month
-            if 'Period' in df.columns:
-                det_per_month = df.groupby('Period').size().reset_index(name='Detections')
+            if period_groups is not None:
+                det_per_month = period_groups.size().reset_index(name='Detections')
                 
                 # Create ECharts options for bar chart
                 options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Detections per Month"},
                     "tooltip": {
                         "trigger": "axis",
@@ -1645,11 +1836,11 @@ def three_month_trend_analysis_dashboard():
                 figures.append(options)  # Store for PDF export        # Top N Hosts (aggregate)
         if 'Hostname' in df.columns:
             st.header(f"Top {top_n} Hosts with Most Detections (Aggregate)")
-            host_counts = df.groupby('Hostname').size().reset_index(name='Count').sort_values('Count', ascending=False).head(top_n)
+            host_counts = df.groupby('Hostname', sort=False, observed=True).size().nlargest(top_n).reset_index(name='Count')
             
             # Create ECharts options for horizontal bar chart
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": f"Top {top_n} Hosts with Most Detections (All Months)"},
                 "tooltip": {
                     "trigger": "axis",
@@ -1691,12 +1882,18 @@ def three_month_trend_analysis_dashboard():
         # Top N Users (aggregate)
         if 'UserName' in df.columns:
             st.header(f"Top {top_n} Users with Most Detections (Aggregate)")
-            filtered_df = df[df['UserName'].str.strip() != '']
-            user_counts = filtered_df.groupby('UserName').size().reset_index(name='Count').sort_values('Count', ascending=False).head(top_n)
+            # Count only rows with a non-blank user name, without copying the whole frame first
+            has_user = df['UserName'].notna() & df['UserName'].str.strip().ne('')
+            users = df.loc[has_user, 'UserName']
+            # groupby keeps first-appearance order for ties (categorical value_counts would use category order)
+            user_counts = (
+                users.groupby(users, sort=False, observed=True).size().nlargest(top_n)
+                .rename_axis('UserName').reset_index(name='Count')
+            )
             
             # Create ECharts options for horizontal bar chart
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": f"Top {top_n} Users with Most Detections (All Months)"},
                 "tooltip": {
                     "trigger": "axis",
@@ -1738,8 +1935,8 @@ def three_month_trend_analysis_dashboard():
         # Platform Distribution (aggregate)
         if 'Platform' in df.columns:
             st.header("Platform Distribution (Aggregate)")
-            platform_counts = df.groupby('Platform').size().reset_index(name='Count').sort_values('Count', ascending=False)
-            os_counts = df.groupby('OS Version').size().reset_index(name='Count').sort_values('Count', ascending=False)
+            platform_counts = df.groupby('Platform', sort=False, observed=True).size().sort_values(ascending=False).reset_index(name='Count')
+            os_counts = df.groupby('OS Version', sort=False, observed=True).size().sort_values(ascending=False).reset_index(name='Count')
             
             if not platform_counts.empty:
                 # Calculate percentages for pie chart
@@ -1747,7 +1944,7 @@ def three_month_trend_analysis_dashboard():
                 
                 # Create pie chart options
                 pie_options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Platform Distribution (All Months)"},
                     "tooltip": {
                         "trigger": "item",
@@ -1793,7 +1990,7 @@ def three_month_trend_analysis_dashboard():
             if not os_counts.empty:
                 # Create bar chart options
                 bar_options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Top OS Versions (All Months)"},
                     "tooltip": {
                         "trigger": "axis",
@@ -1837,11 +2034,11 @@ def three_month_trend_analysis_dashboard():
         # Sensor Version Status (aggregate)
         if 'Sensor Version' in df.columns:
             st.header("Hosts with Sensor Version Status (Aggregate)")
-            sensor_counts = df.groupby('Sensor Version').size().reset_index(name='Count').sort_values('Count', ascending=False)
+            sensor_counts = df.groupby('Sensor Version', sort=False, observed=True).size().sort_values(ascending=False).reset_index(name='Count')
             if not sensor_counts.empty:
                 # Create bar chart options
                 bar_options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Top Sensor Versions (All Months)"},
                     "tooltip": {
                         "trigger": "axis",
@@ -1889,18 +2086,18 @@ def three_month_trend_analysis_dashboard():
             if not pd.api.types.is_datetime64_any_dtype(df['Detect MALAYSIA TIME FORMULA']):
                 df['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(df['Detect MALAYSIA TIME FORMULA'], errors='coerce')
             
-            valid_dates = df['Detect MALAYSIA TIME FORMULA'].dropna()
-            if not valid_dates.empty:
+            # One short-circuiting check for any parsed date instead of copying the non-null dates
+            if df['Detect MALAYSIA TIME FORMULA'].notna().any():
                 # Daily trend line
-                date_counts = df.groupby(df['Detect MALAYSIA TIME FORMULA'].dt.date).size().reset_index(name='Count')
-                date_counts = date_counts.sort_values('Detect MALAYSIA TIME FORMULA')
+                # Group on datetime64 day keys; groupby already returns them in date order
+                date_counts = df.groupby(df['Detect MALAYSIA TIME FORMULA'].dt.floor('D')).size().reset_index(name='Count')
                 
                 # Convert dates to string format for ECharts
-                date_str = [d.strftime('%Y-%m-%d') for d in date_counts['Detect MALAYSIA TIME FORMULA']]
+                date_str = date_counts['Detect MALAYSIA TIME FORMULA'].dt.strftime('%Y-%m-%d').tolist()
                 
                 # Create line chart options
                 line_options = {
-                    **get_theme_options(),
+                    **theme,
                     "title": {"text": "Detection Trend Over Time"},
                     "tooltip": {
                         "trigger": "axis",
@@ -1951,103 +2148,104 @@ def three_month_trend_analysis_dashboard():
                 days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
                 pivot_table = pivot_table.reindex(columns=days_order)
                 
-                # Prepare data for ECharts heatmap
-                weeks = pivot_table.index.tolist()
-                days = pivot_table.columns.tolist()
-                data = []
-                for i, week in enumerate(weeks):
-                    for j, day in enumerate(days):
-                        value = pivot_table.loc[week, day]
-                        count = value if pd.notnull(value) else 0
-                        data.append([j, len(weeks) - 1 - i, count])  # Reverse week order
-                
                 max_count = pivot_table.max().max()
+                # Skip the heatmap entirely when there is nothing to shade
+                if not pivot_table.empty and max_count > 0:
+                    # Prepare data for ECharts heatmap
+                    weeks = pivot_table.index.tolist()
+                    days = pivot_table.columns.tolist()
+                    data = []
+                    for i, week in enumerate(weeks):
+                        for j, day in enumerate(days):
+                            value = pivot_table.loc[week, day]
+                            count = value if pd.notnull(value) else 0
+                            data.append([j, len(weeks) - 1 - i, count])  # Reverse week order
                 
-                # Create heatmap options
-                heatmap_options = {
-                    **get_theme_options(),
-                    "title": {"text": "Weekly Detection Activity Heatmap"},
-                    "tooltip": {
-                        "position": "top",
-                        "formatter": "Week {b}, {a}: {c}"
-                    },
-                    "animation": True,
-                    "grid": {
-                        "height": "80%",
-                        "top": "10%"
-                    },
-                    "xAxis": {
-                        "type": "category",
-                        "data": days,
-                        "splitArea": {
-                            "show": True
-                        }
-                    },
-                    "yAxis": {
-                        "type": "category",
-                        "data": [str(w) for w in weeks][::-1],  # Reverse for proper orientation
-                        "splitArea": {
-                            "show": True
-                        }
-                    },
-                    "visualMap": {
-                        "min": 0,
-                        "max": max_count,
-                        "calculable": True,
-                        "orient": "horizontal",
-                        "left": "center",
-                        "bottom": "5%",
-                        "inRange": {
-                            "color": ['#fed976', '#feb24c', '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026', '#800026']
-                        }
-                    },
-                    "series": [{
-                        "name": "Detections",
-                        "type": "heatmap",
-                        "data": data,
-                        "label": {
-                            "show": False
+                    # Create heatmap options
+                    heatmap_options = {
+                        **theme,
+                        "title": {"text": "Weekly Detection Activity Heatmap"},
+                        "tooltip": {
+                            "position": "top",
+                            "formatter": "Week {b}, {a}: {c}"
                         },
-                        "emphasis": {
-                            "itemStyle": {
-                                "shadowBlur": 10,
-                                "shadowColor": "rgba(0, 0, 0, 0.5)"
+                        "animation": True,
+                        "grid": {
+                            "height": "80%",
+                            "top": "10%"
+                        },
+                        "xAxis": {
+                            "type": "category",
+                            "data": days,
+                            "splitArea": {
+                                "show": True
                             }
-                        }
-                    }]
-                }
-                # Show the heatmap
-                st_echarts(
-                    options=heatmap_options,
-                    height="400px"
-                )
-                figures.append(heatmap_options)  # Store for PDF export
+                        },
+                        "yAxis": {
+                            "type": "category",
+                            "data": [str(w) for w in weeks][::-1],  # Reverse for proper orientation
+                            "splitArea": {
+                                "show": True
+                            }
+                        },
+                        "visualMap": {
+                            "min": 0,
+                            "max": max_count,
+                            "calculable": True,
+                            "orient": "horizontal",
+                            "left": "center",
+                            "bottom": "5%",
+                            "inRange": {
+                                "color": ['#fed976', '#feb24c', '#fd8d3c', '#fc4e2a', '#e31a1c', '#bd0026', '#800026']
+                            }
+                        },
+                        "series": [{
+                            "name": "Detections",
+                            "type": "heatmap",
+                            "data": data,
+                            "label": {
+                                "show": False
+                            },
+                            "emphasis": {
+                                "itemStyle": {
+                                    "shadowBlur": 10,
+                                    "shadowColor": "rgba(0, 0, 0, 0.5)"
+                                }
+                            }
+                        }]
+                    }
+                    # Show the heatmap
+                    st_echarts(
+                        options=heatmap_options,
+                        height="400px"
+                    )
+                    figures.append(heatmap_options)  # Store for PDF export
 
                 
                 # Show detailed statistics
                 st.subheader("Detection Activity Statistics")
+                daily_values = date_counts['Count'].to_numpy()
+                peak_idx = int(daily_values.argmax())
                 col1, col2, col3 = st.columns(3)
                 with col1:
                     st.metric("Average Daily Detections", 
-                            f"{date_counts['Count'].mean():.1f}")
+                            f"{daily_values.mean():.1f}")
                 with col2:
                     st.metric("Peak Daily Detections", 
-                            f"{date_counts['Count'].max()}")
+                            f"{daily_values[peak_idx]}")
                 with col3:
-                    peak_date = date_counts.loc[date_counts['Count'].idxmax(), 'Detect MALAYSIA TIME FORMULA']
                     st.metric("Peak Detection Date", 
-                            peak_date.strftime('%Y-%m-%d'))
+                            date_str[peak_idx])
                 
                 # Show data table
-                st.dataframe(date_counts.rename(
-                    columns={'Detect MALAYSIA TIME FORMULA': 'Date', 'Count': 'Detections'}
-                ).sort_values('Date', ascending=False), 
+                st.dataframe(pd.DataFrame(
+                    {'Date': date_str, 'Detections': daily_values}
+                ).iloc[::-1], 
                 use_container_width=True)
 
         # Executive Summary (aggregate)
         st.header("Executive Summary (Aggregate)")
-        top_host = df.groupby('Hostname').size().idxmax() if not df.empty and 'Hostname' in df.columns else ''
-        top_host_count = df.groupby('Hostname').size().max() if not df.empty and 'Hostname' in df.columns else 0
+        top_host, top_host_count = get_top_host(df)
         summary_lines = [
             f"This 3-month trend report reveals {total_hosts} unique hosts with {total_detections} security detections.",
             f"The host '{top_host}' shows the highest detection count at {top_host_count}.",
@@ -2055,331 +2253,14 @@ def three_month_trend_analysis_dashboard():
             "Prioritize remediation for high-risk hosts and update sensor versions on outdated hosts."
         ]
         st.markdown("\n".join([f"- {line}" for line in summary_lines]))
-    elif template == "Host Analysis":
-        # Overview metrics (aggregate and per month)
-        st.header("Host Overview Metrics")
-        if 'Hostname' in df.columns and 'Period' in df.columns:
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
-                total_hosts = period_df['Hostname'].nunique()
-                total_detections = len(period_df)
-                windows_hosts = period_df[period_df['OS Version'].str.contains('Windows', na=False)]['Hostname'].nunique() if 'OS Version' in period_df.columns else 0
-                avg_detections = round(total_detections / total_hosts, 2) if total_hosts > 0 else 0
-                st.subheader(f"{period} - Metrics")
-                col1, col2, col3, col4 = st.columns(4)
-                col1.metric("Total Hosts", total_hosts)
-                col2.metric("Total Detections", total_detections)
-                col3.metric("Windows Hosts", windows_hosts)
-                col4.metric("Avg. Detections/Host", avg_detections)
-
-        # Top N Hosts with Most Detections (bar chart + table)
-        st.header(f"Top {top_n} Hosts with Most Detections (per Month)")
-        if 'Hostname' in df.columns and 'Period' in df.columns:
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
-                host_counts = period_df.groupby('Hostname').size().reset_index(name='Count').sort_values('Count', ascending=False).head(top_n)
-                # Create horizontal bar chart with ECharts
-                bar_options = {
-                    **get_theme_options(),
-                    "title": {"text": f"{period} - Top {top_n} Hosts with Most Detections"},
-                    "tooltip": {
-                        "trigger": "axis",
-                        "axisPointer": {"type": "shadow"}
-                    },
-                    "grid": {
-                        "top": "50",
-                        "bottom": "50",
-                        "left": "25%",
-                        "right": "10%"
-                    },
-                    "yAxis": {
-                        "type": "category",
-                        "data": host_counts['Hostname'].tolist(),
-                        "inverse": True,
-                        "axisLabel": {
-                            "width": 150,
-                            "overflow": "break"
-                        }
-                    },
-                    "xAxis": {
-                        "type": "value",
-                        "name": "Number of Detections"
-                    },
-                    "series": [{
-                        "type": "bar",
-                        "data": host_counts['Count'].tolist(),
-                        "itemStyle": {"color": SECONDARY_COLOR},
-                        "label": {
-                            "show": True,
-                            "position": "right",
-                            "formatter": "{c}"
-                        }
-                    }]
-                }
-                
-                # Show the horizontal bar chart
-                st_echarts(
-                    options=bar_options,
-                    height="400px"
-                )
-                figures.append(bar_options)
-                st.dataframe(host_counts, use_container_width=True)
-
-        # Top N Users with Most Detections (bar chart + table)
-        st.header(f"Top {top_n} Users with Most Detections (per Month)")
-        if 'UserName' in df.columns and 'Period' in df.columns:
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
-                filtered_df = period_df[period_df['UserName'].str.strip() != '']
-                user_counts = filtered_df.groupby('UserName').size().reset_index(name='Count').sort_values('Count', ascending=False).head(top_n)
-                # Create horizontal bar chart with ECharts
-                bar_options = {
-                    **get_theme_options(),
-                    "title": {"text": f"{period} - Top {top_n} Users with Most Detections"},
-                    "tooltip": {
-                        "trigger": "axis",
-                        "axisPointer": {"type": "shadow"}
-                    },
-                    "grid": {
-                        "top": "50",
-                        "bottom": "50",
-                        "left": "25%",
-                        "right": "10%"
-                    },
-                    "yAxis": {
-                        "type": "category",
-                        "data": user_counts['UserName'].tolist(),
-                        "inverse": True,
-                        "axisLabel": {
-                            "width": 150,
-                            "overflow": "break"
-                        }
-                    },
-                    "xAxis": {
-                        "type": "value",
-                        "name": "Number of Detections"
-                    },
-                    "series": [{
-                        "type": "bar",
-                        "data": user_counts['Count'].tolist(),
-                        "itemStyle": {"color": MAIN_COLOR},
-                        "label": {
-                            "show": True,
-                            "position": "right",
-                            "formatter": "{c}"
-                        }
-                    }]
-                }
-                
-                # Show the horizontal bar chart
-                st_echarts(
-                    options=bar_options,
-                    height="400px"
-                )
-                figures.append(bar_options)
-                st.dataframe(user_counts, use_container_width=True)
-
-        # Platform Distribution (pie chart + bar chart for OS versions)
-        st.header("Platform Distribution (per Month)")
-        if 'Platform' in df.columns and 'Period' in df.columns:
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
-                platform_counts = period_df.groupby('Platform').size().reset_index(name='Count').sort_values('Count', ascending=False)
-                os_counts = period_df.groupby('OS Version').size().reset_index(name='Count').sort_values('Count', ascending=False)
-                if not platform_counts.empty:
-                    fig, ax = plt.subplots()
-                    ax.pie(platform_counts['Count'], labels=platform_counts['Platform'], autopct='%1.1f%%', colors=[MAIN_COLOR, SECONDARY_COLOR, BAR_COLOR])
-                    ax.set_title(f"{period} - Platform Distribution")
-                    st.pyplot(fig)
-                    figures.append(fig)
-                if not os_counts.empty:
-                    # Create bar chart with ECharts
-                    bar_options = {
-                        **get_theme_options(),
-                        "title": {"text": f"{period} - Top OS Versions"},
-                        "tooltip": {
-                            "trigger": "axis",
-                            "axisPointer": {"type": "shadow"}
-                        },
-                        "grid": {
-                            "left": "3%",
-                            "right": "4%",
-                            "bottom": "15%",
-                            "containLabel": True
-                        },
-                        "xAxis": {
-                            "type": "category",
-                            "data": os_counts['OS Version'].tolist(),
-                            "name": "OS Version",
-                            "axisLabel": {
-                                "rotate": 45,
-                                "interval": 0,
-                                "width": 120,
-                                "overflow": "break"
-                            }
-                        },
-                        "yAxis": {
-                            "type": "value",
-                            "name": "Number of Detections"
-                        },
-                        "series": [{
-                            "type": "bar",
-                            "data": os_counts['Count'].tolist(),
-                            "itemStyle": {"color": SECONDARY_COLOR},
-                            "label": {
-                                "show": True,
-                                "position": "top",
-                                "formatter": "{c}"
-                            }
-                        }]
-                    }
-                    
-                    # Show the bar chart
-                    st_echarts(
-                        options=bar_options,
-                        height="400px"
-                    )
-                    figures.append(bar_options)
-                    st.dataframe(os_counts.head(top_n), use_container_width=True)
-
-        # Sensor Version Status (bar chart)
-        st.header("Hosts with Sensor Version Status (per Month)")
-        if 'Sensor Version' in df.columns and 'Period' in df.columns:
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
-                sensor_counts = period_df.groupby('Sensor Version').size().reset_index(name='Count').sort_values('Count', ascending=False)
-                if not sensor_counts.empty:
-                    # Create bar chart with ECharts
-                    bar_options = {
-                        **get_theme_options(),
-                        "title": {"text": f"{period} - Top Sensor Versions"},
-                        "tooltip": {
-                            "trigger": "axis",
-                            "axisPointer": {"type": "shadow"}
-                        },
-                        "grid": {
-                            "left": "3%",
-                            "right": "4%",
-                            "bottom": "15%",
-                            "containLabel": True
-                        },
-                        "xAxis": {
-                            "type": "category",
-                            "data": sensor_counts['Sensor Version'].tolist(),
-                            "name": "Sensor Version",
-                            "axisLabel": {
-                                "rotate": 45,
-                                "interval": 0,
-                                "width": 120,
-                                "overflow": "break"
-                            }
-                        },
-                        "yAxis": {
-                            "type": "value",
-                            "name": "Number of Hosts"
-                        },
-                        "series": [{
-                            "type": "bar",
-                            "data": sensor_counts['Count'].tolist(),
-                            "itemStyle": {"color": BAR_COLOR},
-                            "label": {
-                                "show": True,
-                                "position": "top",
-                                "formatter": "{c}"
-                            }
-                        }]
-                    }
-                    
-                    # Show the bar chart
-                    st_echarts(
-                        options=bar_options,
-                        height="400px"
-                    )
-                    figures.append(bar_options)
-                    st.dataframe(sensor_counts.head(top_n), use_container_width=True)
-
-        # Detection Activity Over Time (line chart)
-        st.header("Detection Activity Over Time (per Month)")
-        if 'Detect MALAYSIA TIME FORMULA' in df.columns and 'Period' in df.columns:
-            for period in df['Period'].unique():
-                period_df = df[df['Period'] == period]
-                if not df['Detect MALAYSIA TIME FORMULA'].isna().all():
-                    date_counts = df.groupby(df['Detect MALAYSIA TIME FORMULA'].dt.date).size().reset_index(name='Count')
-                    # Create line chart with ECharts
-                    line_options = {
-                        **get_theme_options(),
-                        "title": {"text": "Detection Activity Over Time (All Months)"},
-                        "tooltip": {
-                            "trigger": "axis",
-                            "axisPointer": {"type": "cross"}
-                        },
-                        "grid": {
-                            "left": "3%",
-                            "right": "4%",
-                            "bottom": "15%",
-                            "containLabel": True
-                        },
-                        "xAxis": {
-                            "type": "category",
-                            "data": [d.strftime('%Y-%m-%d') for d in date_counts['Detect MALAYSIA TIME FORMULA']],
-                            "name": "Date",
-                            "axisLabel": {
-                                "rotate": 45,
-                                "interval": "auto"
-                            }
-                        },
-                        "yAxis": {
-                            "type": "value",
-                            "name": "Detections"
-                        },
-                        "series": [{
-                            "name": "Detections",
-                            "type": "line",
-                            "data": date_counts['Count'].tolist(),
-                            "itemStyle": {"color": MAIN_COLOR},
-                            "symbol": "circle",
-                            "symbolSize": 6,
-                            "lineStyle": {"width": 2},
-                            "label": {
-                                "show": False
-                            }
-                        }]
-                    }
-                    
-                    # Show the line chart
-                    st_echarts(
-                        options=line_options,
-                        height="400px"
-                    )
-                    figures.append(line_options)
-                    st.dataframe(date_counts, use_container_width=True)
-
-            # Executive Summary (aggregate, improved markdown)
-            st.header("Executive Summary (Aggregate)")
-            top_host = df.groupby('Hostname').size().idxmax() if not df.empty and 'Hostname' in df.columns else ''
-            top_host_count = df.groupby('Hostname').size().max() if not df.empty and 'Hostname' in df.columns else 0
-            summary_lines = [
-                f"This 3-month trend report reveals {total_hosts} unique hosts with {total_detections} security detections.",
-                f"The host '{top_host}' shows the highest detection count at {top_host_count}.",
-                f"Windows is the dominant platform ({windows_hosts} Windows hosts).",
-                "Prioritize remediation for high-risk hosts and update sensor versions on outdated hosts."
-            ]
-            st.markdown("\n".join([f"- {line}" for line in summary_lines]))
     # ========== Time Analysis Visualizations ==========
     elif template == "Time Analysis":
         st.header("Time-Based Trend Analysis")
 
         # Prepare time-based data
         if 'Detect MALAYSIA TIME FORMULA' in df.columns:
-            # Robust datetime parsing for mixed formats
-            df['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(
-                df['Detect MALAYSIA TIME FORMULA'],
-                dayfirst=True, errors='coerce'
-            )
-            # Extract time components
-            df['Hour'] = df['Detect MALAYSIA TIME FORMULA'].dt.hour
-            df['Day_of_Week'] = df['Detect MALAYSIA TIME FORMULA'].dt.dayofweek
-            df['Day_Name'] = df['Detect MALAYSIA TIME FORMULA'].dt.day_name()
+            # Parse times and extract time components (cached across reruns)
+            df = enrich_time_features(df)
             
             # Basic metrics
             total_detections = len(df)
@@ -2387,26 +2268,13 @@ def three_month_trend_analysis_dashboard():
             # === 1. Monthly Activity Pattern Analysis ===
             st.subheader("Monthly Activity Patterns")
             
-            # Business Hours vs Non-Business Hours by Month
-            business_hours = df[df['Hour'].between(9, 16)]  # 9 AM to 5 PM
-            monthly_time_dist = pd.DataFrame({
-                'Period': df['Period'].unique()
-            })
-            
-            for period in monthly_time_dist['Period']:
-                period_data = df[df['Period'] == period]
-                period_business = business_hours[business_hours['Period'] == period]
-                total_count = len(period_data)
-                if total_count > 0:
-                    business_pct = len(period_business) / total_count * 100
-                else:
-                    business_pct = 0
-                monthly_time_dist.loc[monthly_time_dist['Period'] == period, 'Business_Hours_Pct'] = business_pct
-                monthly_time_dist.loc[monthly_time_dist['Period'] == period, 'After_Hours_Pct'] = 100 - business_pct
+            # Business Hours vs Non-Business Hours by Month, plus the hourly and weekday
+            # count matrices used below (cached across reruns)
+            monthly_time_dist, hourly_pivot, dow_pivot = summarize_time_patterns(df)
             
             # Create visualization
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Business Hours vs After Hours Detection Trend"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": ["Business Hours (9AM-5PM)", "After Hours"]},
@@ -2425,14 +2293,14 @@ def three_month_trend_analysis_dashboard():
                         "name": "Business Hours (9AM-5PM)",
                         "type": "bar",
                         "stack": "total",
-                        "data": [round(x, 1) for x in monthly_time_dist['Business_Hours_Pct']],
+                        "data": monthly_time_dist['Business_Hours_Pct'].round(1).tolist(),
                         "label": {"show": True, "formatter": "{c}%"}
                     },
                     {
                         "name": "After Hours",
                         "type": "bar",
                         "stack": "total",
-                        "data": [round(x, 1) for x in monthly_time_dist['After_Hours_Pct']],
+                        "data": monthly_time_dist['After_Hours_Pct'].round(1).tolist(),
                         "label": {"show": True, "formatter": "{c}%"}
                     }
                 ]
@@ -2443,12 +2311,11 @@ def three_month_trend_analysis_dashboard():
             # === 2. Hourly Pattern Analysis ===
             st.subheader("Hourly Detection Patterns Across Months")
             
-            hourly_dist = df.groupby(['Period', 'Hour']).size().reset_index(name='Count')
-            periods = hourly_dist['Period'].unique()
+            periods = hourly_pivot.index
             
             # Create visualization
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Hourly Detection Distribution by Month"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": [str(p) for p in periods]},
@@ -2466,9 +2333,7 @@ def three_month_trend_analysis_dashboard():
                     {
                         "name": str(period),
                         "type": "line",
-                        "data": [int(hourly_dist[(hourly_dist['Period'] == period) & 
-                                               (hourly_dist['Hour'] == hour)]['Count'].sum())
-                                for hour in range(24)],
+                        "data": hourly_pivot.loc[period].tolist(),
                         "symbol": "circle",
                         "symbolSize": 8,
                         "label": {"show": True}
@@ -2481,12 +2346,9 @@ def three_month_trend_analysis_dashboard():
             # === 3. Day of Week Analysis ===
             st.subheader("Day of Week Patterns Across Months")
             
-            dow_dist = df.groupby(['Period', 'Day_Name', 'Day_of_Week']).size().reset_index(name='Count')
-            dow_dist = dow_dist.sort_values('Day_of_Week')
-            
             # Create visualization
             options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Weekly Detection Pattern by Month"},
                 "tooltip": {"trigger": "axis", "axisPointer": {"type": "shadow"}},
                 "legend": {"data": [str(p) for p in periods]},
@@ -2503,9 +2365,7 @@ def three_month_trend_analysis_dashboard():
                     {
                         "name": str(period),
                         "type": "bar",
-                        "data": [int(dow_dist[(dow_dist['Period'] == period) & 
-                                            (dow_dist['Day_of_Week'] == day)]['Count'].sum())
-                                for day in range(7)]
+                        "data": dow_pivot.loc[period].tolist()
                     } for period in periods
                 ]
             }
@@ -2516,12 +2376,16 @@ def three_month_trend_analysis_dashboard():
             st.subheader("Time-Based Pattern Summary")
             
             # Calculate summary metrics
-            peak_hours = df.groupby('Hour')['Period'].count().idxmax()
-            peak_day = df.groupby('Day_Name')['Period'].count().idxmax()
+            # Counts sorted by key so a tie goes to the earliest hour / first day name, as the
+            # groupby(...).idxmax() lookup did
+            peak_hours = int(df['Hour'].value_counts(sort=False).sort_index().idxmax())
+            peak_day = df['Day_Name'].value_counts(sort=False).sort_index().idxmax()
             
             # Business hours percentage trend
-            business_hours_trend = "increasing" if monthly_time_dist['Business_Hours_Pct'].is_monotonic_increasing else \
-                                 "decreasing" if monthly_time_dist['Business_Hours_Pct'].is_monotonic_decreasing else \
+            business_pct_values = monthly_time_dist['Business_Hours_Pct'].to_numpy()
+            business_pct_diffs = np.diff(business_pct_values)
+            business_hours_trend = "increasing" if (business_pct_diffs >= 0).all() else \
+                                 "decreasing" if (business_pct_diffs <= 0).all() else \
                                  "fluctuating"
             
             # Create metrics display
@@ -2537,7 +2401,7 @@ def three_month_trend_analysis_dashboard():
                 f"📊 {peak_day} shows consistently higher detection volumes",
                 f"⏰ Business hours detection pattern is {business_hours_trend}",
                 "🔄 Monthly comparison shows " + (
-                    "consistent patterns" if len(set(monthly_time_dist['Business_Hours_Pct'])) <= 2
+                    "consistent patterns" if np.unique(np.round(business_pct_values, 1)).size <= 2
                     else "varying patterns"
                 ) + " in detection timing"
             ]
@@ -2550,12 +2414,17 @@ def three_month_trend_analysis_dashboard():
             det_per_month = df.groupby('Period').size().reset_index(name='Detections')
 
             # Calculate trend line
-            x_trend = np.arange(len(det_per_month))
-            y_trend = np.poly1d(np.polyfit(x_trend, det_per_month['Detections'], 1))(x_trend)
+            # Closed-form least-squares line; only a handful of months, so skip polyfit/poly1d
+            x_centered = np.arange(len(det_per_month), dtype=np.float64)
+            x_centered -= x_centered.mean()
+            y_values = det_per_month['Detections'].to_numpy(dtype=np.float64)
+            x_spread = np.dot(x_centered, x_centered)
+            slope = np.dot(x_centered, y_values - y_values.mean()) / x_spread if x_spread else 0.0
+            y_trend = y_values.mean() + slope * x_centered
             
             # Create line chart options
             line_options = {
-                **get_theme_options(),
+                **theme,
                 "title": {"text": "Detections per Month (Time Analysis)"},
                 "tooltip": {
                     "trigger": "axis",
@@ -2619,18 +2488,20 @@ def three_month_trend_analysis_dashboard():
         if 'Hour' in df.columns and 'Period' in df.columns:
             st.header("Hourly Detection Trend per Month")
             hour_trend = df.groupby(['Period', 'Hour']).size().reset_index(name='Count')
+            hour_trend_by_period = dict(tuple(hour_trend.groupby('Period', sort=False)))
             
             # Create tabs for each period
             # Create tabs container
-            tabs_container = st.tabs(list(df['Period'].unique()))
-            for period, tab in zip(df['Period'].unique(), tabs_container):
+            tabs_container = st.tabs(period_list)
+            for period, tab in zip(period_list, tabs_container):
                 with tab:
-                    period_df = hour_trend[hour_trend['Period'] == period]
-                    hours = sorted(period_df['Hour'].unique())
+                    period_df = hour_trend_by_period.get(period, hour_trend.iloc[:0])
+                    # Bar and trend line plot the same counts, so both series read them from one shared dataset
+                    hour_source = [["Hour", "Count"]] + [[str(h), c] for h, c in zip(period_df['Hour'].tolist(), period_df['Count'].tolist())]
                     
                     # Create mixed chart options
                     mixed_options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Hourly Detection Trend"},
                         "tooltip": {
                             "trigger": "axis",
@@ -2645,9 +2516,9 @@ def three_month_trend_analysis_dashboard():
                             "right": "4%",
                             "containLabel": True
                         },
+                        "dataset": {"source": hour_source},
                         "xAxis": {
                             "type": "category",
-                            "data": [str(h) for h in hours],
                             "name": "Hour of Day",
                             "axisLabel": {"formatter": "{value}:00"}
                         },
@@ -2659,7 +2530,7 @@ def three_month_trend_analysis_dashboard():
                             {
                                 "name": "Bar",
                                 "type": "bar",
-                                "data": period_df['Count'].tolist(),
+                                "encode": {"x": "Hour", "y": "Count"},
                                 "itemStyle": {"color": SECONDARY_COLOR, "opacity": 0.6},
                                 "label": {
                                     "show": False
@@ -2668,7 +2539,7 @@ def three_month_trend_analysis_dashboard():
                             {
                                 "name": "Trend Line",
                                 "type": "line",
-                                "data": period_df['Count'].tolist(),
+                                "encode": {"x": "Hour", "y": "Count"},
                                 "smooth": True,
                                 "symbolSize": 6,
                                 "itemStyle": {"color": MAIN_COLOR},
@@ -2692,20 +2563,21 @@ def three_month_trend_analysis_dashboard():
         if 'Day_Name' in df.columns and 'Period' in df.columns:
             st.header("Day of Week Detection Trend per Month")
             day_trend = df.groupby(['Period', 'Day_Name']).size().reset_index(name='Count')
+            day_trend_by_period = dict(tuple(day_trend.groupby('Period', sort=False)))
             days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             
             # Create tabs container for each period
-            period_tabs = st.tabs(list(df['Period'].unique()))
-            for period, tab in zip(df['Period'].unique(), period_tabs):
+            period_tabs = st.tabs(period_list)
+            for period, tab in zip(period_list, period_tabs):
                 with tab:
-                    period_df = day_trend[day_trend['Period'] == period]
-                    # Sort the data by day of week
-                    period_df['Day_Name'] = pd.Categorical(period_df['Day_Name'], categories=days_order, ordered=True)
-                    period_df = period_df.sort_values('Day_Name')
+                    period_df = day_trend_by_period.get(period, day_trend.iloc[:0])
+                    # Align counts to Monday..Sunday so they match the x-axis (missing days count as 0)
+                    counts_list = period_df.set_index('Day_Name')['Count'].reindex(days_order, fill_value=0).tolist()
+                    day_source = [["Day", "Count"]] + [[day, c] for day, c in zip(days_order, counts_list)]
                     
                     # Create mixed chart options
                     mixed_options = {
-                        **get_theme_options(),
+                        **theme,
                         "title": {"text": f"{period} - Day of Week Detection Trend"},
                         "tooltip": {
                             "trigger": "axis",
@@ -2720,9 +2592,9 @@ def three_month_trend_analysis_dashboard():
                             "right": "4%",
                             "containLabel": True
                         },
+                        "dataset": {"source": day_source},
                         "xAxis": {
                             "type": "category",
-                            "data": days_order,
                             "name": "Day of Week",
                             "axisLabel": {
                                 "rotate": 45,
@@ -2737,18 +2609,19 @@ def three_month_trend_analysis_dashboard():
                             {
                                 "name": "Bar",
                                 "type": "bar",
-                                "data": period_df['Count'].tolist(),
+                                "encode": {"x": "Day", "y": "Count"},
                                 "itemStyle": {"color": BAR_COLOR, "opacity": 0.6},
                                 "label": {
                                     "show": True,
                                     "position": "top",
-                                    "formatter": "{c}"
+                                    # With a dataset, {c} is the whole row; label with the Count column only
+                                    "formatter": "{@Count}"
                                 }
                             },
                             {
                                 "name": "Trend Line",
                                 "type": "line",
-                                "data": period_df['Count'].tolist(),
+                                "encode": {"x": "Day", "y": "Count"},
                                 "smooth": True,
                                 "symbolSize": 6,
                                 "itemStyle": {"color": MAIN_COLOR},
@@ -2769,23 +2642,22 @@ def three_month_trend_analysis_dashboard():
     if export_pdf and figures:
         try:
             from matplotlib.backends.backend_pdf import PdfPages
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmpfile:
-                pdf_path = tmpfile.name
-                with PdfPages(pdf_path) as pdf:
-                    for fig in figures:
+            # Build the PDF in memory; download_button takes the bytes directly
+            pdf_buffer = io.BytesIO()
+            with PdfPages(pdf_buffer) as pdf:
+                # figures holds ECharts option dicts; redraw each one with Matplotlib only now
+                for chart_options in figures:
+                    fig = echarts_options_to_figure(chart_options)
+                    if fig is not None:
                         pdf.savefig(fig, bbox_inches='tight')
-                with open(pdf_path, 'rb') as f:
-                    st.download_button(
-                        label="Download All Visuals as PDF",
-                        data=f.read(),
-                        file_name="three_month_trend_visuals.pdf",
-                        mime="application/pdf"
-                    )
+            st.download_button(
+                label="Download All Visuals as PDF",
+                data=pdf_buffer.getvalue(),
+                file_name="three_month_trend_visuals.pdf",
+                mime="application/pdf",
+                key="three_month_pdf_download_trends"
+            )
             st.success("PDF generated! Download using the button above.")
-            # Clean up temp file
-            os.remove(pdf_path)
         except Exception as e:
             st.error(f"PDF export failed: {e}")
 
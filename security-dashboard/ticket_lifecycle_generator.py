@@ -14,7 +14,9 @@ Developed by Izami Ariff © 2025
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+import streamlit as st
+from types import MappingProxyType
+from typing import Dict, List, Mapping
 
 # Display label mapping for Status values
 STATUS_DISPLAY_LABELS = {
@@ -25,10 +27,52 @@ STATUS_DISPLAY_LABELS = {
     'on-hold': 'On-Hold'
 }
 
+# Status order used for the pivot rows, and the severity columns counted per Request ID
+STATUS_ORDER = ['closed', 'in_progress', 'open', 'pending', 'on-hold']
+SEVERITY_COLUMNS = ['Critical', 'High', 'Medium', 'Low']
+
+# Lower-cased raw values mapped to their canonical severity / status (read-only, shared by every call)
+SEVERITY_MAPPING = MappingProxyType({
+    'critical': 'Critical',
+    'high': 'High',
+    'medium': 'Medium',
+    'low': 'Low',
+    'n/a': 'N/A'
+})
+STATUS_MAPPING = MappingProxyType({
+    'closed': 'closed',
+    'in_progress': 'in_progress',
+    'in progress': 'in_progress',
+    'open': 'open',
+    'pending': 'pending',
+    'on-hold': 'on-hold',
+    'on_hold': 'on-hold',
+    'on hold': 'on-hold'
+})
+
 def format_status_label(status: str) -> str:
     """Convert internal status to display label"""
     return STATUS_DISPLAY_LABELS.get(status, status.replace('_', ' ').title())
 
+def _normalize_to_category(values: pd.Series, mapping: Mapping[str, str], known_order: List[str]) -> pd.Categorical:
+    """
+    Map raw values to canonical labels as an ordered categorical
+
+    The (few) distinct raw values are stripped, lower-cased and looked up in `mapping` once each,
+    then every row is re-coded with an integer lookup. Unknown values keep their original text and
+    are ordered after `known_order`; missing values stay missing.
+    """
+    raw = pd.Categorical(values)
+    canonical = [mapping.get(str(category).strip().lower(), category) for category in raw.categories]
+    categories = known_order + [c for c in dict.fromkeys(canonical) if c not in known_order]
+    position = {category: code for code, category in enumerate(categories)}
+    # The trailing -1 is picked up by missing values, whose raw code is -1
+    code_lookup = np.array([position[c] for c in canonical] + [-1], dtype=np.int64)
+    return pd.Categorical.from_codes(code_lookup[raw.codes], categories=categories, ordered=True)
+
+# Cached on the ticket data's content: re-running the analysis on unchanged data (e.g. "Update Analysis"
+# with no new exclusions) returns the stored results. Safe because the input frame is never modified.
+@st.cache_data(show_spinner=False)
 def generate_ticket_lifecycle_analysis(ticket_df: pd.DataFrame, num_months: int) -> Dict[str, pd.DataFrame]:
     """
     Generate detection status analysis by severity with Request ID pivot table
@@ -46,89 +90,102 @@ def generate_ticket_lifecycle_analysis(ticket_df: pd.DataFrame, num_months: int)
     if ticket_df.empty:
         return results
 
+    # Derived and normalized columns are staged here and attached in one step below,
+    # so the caller's DataFrame is never modified
+    columns = {}
+
     # Ensure required columns exist
-    if 'Period' not in ticket_df.columns:
-        ticket_df['Period'] = 'Unknown'
-    if 'Status' not in ticket_df.columns:
-        ticket_df['Status'] = 'Unknown'
+    period = ticket_df['Period'] if 'Period' in ticket_df.columns else pd.Series('Unknown', index=ticket_df.index)
+    # Period is the leading key of every groupby below; as a categorical it is hashed only once
+    columns['Period'] = pd.Categorical(period)
+    status = ticket_df['Status'] if 'Status' in ticket_df.columns else pd.Series('Unknown', index=ticket_df.index)
+
+    # Normalize status values (matched case-insensitively, unknown values kept as-is);
+    # Status and SeverityName become ordered categoricals so later groupbys work on integer codes
+    columns['Status'] = _normalize_to_category(status, STATUS_MAPPING, STATUS_ORDER)
 
     # Request ID is required for this format
     if 'Request ID' not in ticket_df.columns and 'RequestID' not in ticket_df.columns:
-        ticket_df['Request ID'] = range(1, len(ticket_df) + 1)
+        columns['Request ID'] = np.arange(1, len(ticket_df) + 1, dtype=np.int64)
     elif 'RequestID' in ticket_df.columns:
-        ticket_df['Request ID'] = ticket_df['RequestID']
+        columns['Request ID'] = ticket_df['RequestID']
 
     # Check for SeverityName column (required)
-    has_severity = 'SeverityName' in ticket_df.columns or 'Severity' in ticket_df.columns
-
-    if not has_severity:
+    if 'SeverityName' in ticket_df.columns:
+        severity = ticket_df['SeverityName']
+    elif 'Severity' in ticket_df.columns:
+        severity = ticket_df['Severity']
+    else:
         # Add default severity if not provided
-        ticket_df['SeverityName'] = 'N/A'
-    elif 'Severity' in ticket_df.columns and 'SeverityName' not in ticket_df.columns:
-        ticket_df['SeverityName'] = ticket_df['Severity']
-
-    # Normalize severity values
-    severity_mapping = {
-        'critical': 'Critical',
-        'Critical': 'Critical',
-        'CRITICAL': 'Critical',
-        'high': 'High',
-        'High': 'High',
-        'HIGH': 'High',
-        'medium': 'Medium',
-        'Medium': 'Medium',
-        'MEDIUM': 'Medium',
-        'low': 'Low',
-        'Low': 'Low',
-        'LOW': 'Low',
-        'N/A': 'N/A',
-        'n/a': 'N/A'
-    }
-    ticket_df['SeverityName'] = ticket_df['SeverityName'].fillna('N/A').map(severity_mapping).fillna(ticket_df['SeverityName'])
-
-    # Normalize status values
-    status_mapping = {
-        'closed': 'closed',
-        'Closed': 'closed',
-        'CLOSED': 'closed',
-        'in_progress': 'in_progress',
-        'In Progress': 'in_progress',
-        'IN_PROGRESS': 'in_progress',
-        'in progress': 'in_progress',
-        'open': 'open',
-        'Open': 'open',
-        'OPEN': 'open',
-        'pending': 'pending',
-        'Pending': 'pending',
-        'PENDING': 'pending',
-        'on-hold': 'on-hold',
-        'On-hold': 'on-hold',
-        'ON-HOLD': 'on-hold',
-        'on hold': 'on-hold'
-    }
-    ticket_df['Status'] = ticket_df['Status'].map(status_mapping).fillna(ticket_df['Status'])
+        severity = pd.Series('N/A', index=ticket_df.index)
 
-    # Create Month column (same as Period for consistency)
-    ticket_df['Month'] = ticket_df['Period']
+    # Normalize severity values the same way
+    columns['SeverityName'] = _normalize_to_category(severity.fillna('N/A'), SEVERITY_MAPPING, SEVERITY_COLUMNS + ['N/A'])
+
+    ticket_df = ticket_df.assign(**columns)
 
     # Check if "Count of SeverityName" column exists (new format)
     has_count_column = 'Count of SeverityName' in ticket_df.columns
 
     # If count column exists, expand the data to individual rows
     if has_count_column:
-        # Expand rows based on count
-        expanded_rows = []
-        for _, row in ticket_df.iterrows():
-            count = int(row.get('Count of SeverityName', 1))
-            for _ in range(count):
-                expanded_rows.append(row.to_dict())
-        ticket_df = pd.DataFrame(expanded_rows)
+        # Expand rows based on count (repeat each row position, then take rows in one gather);
+        # positions work for any index, and a negative count yields no rows
+        counts = ticket_df['Count of SeverityName'].fillna(1).astype(np.int64).clip(lower=0).to_numpy()
+        ticket_df = ticket_df.iloc[np.repeat(np.arange(len(ticket_df)), counts)].reset_index(drop=True)
+
+    # ============================================
+    # Aggregate all months in one pass, then slice each month's results
+    # ============================================
+    # One multi-key count over the ticket rows; the pivot, summary and chart tables are all
+    # reduced from this small table instead of scanning ticket_df again.
+    # sort=False keeps Request IDs in order of appearance within each status; dropna=False keeps
+    # rows with a missing Request ID, which the pivot lists as an all-zero row
+    base_counts = ticket_df.groupby(['Period', 'Status', 'Request ID', 'SeverityName'], sort=False, observed=True, dropna=False).size()
+    base_df = base_counts.reset_index(name='Count')
+
+    # Tally severities per (Period, Status, Request ID) with one weighted bincount over integer codes
+    known_status_df = base_df[base_df['Status'].isin(STATUS_ORDER)]
+    pivot_groups = known_status_df.groupby(['Period', 'Status', 'Request ID'], sort=False, observed=True, dropna=False)
+    group_codes = pivot_groups.ngroup().to_numpy(dtype=np.int64)
+    # SeverityName categories start with SEVERITY_COLUMNS, so their codes are the pivot column positions;
+    # a missing Request ID never matches itself, so its row keeps zero counts
+    severity_codes = known_status_df['SeverityName'].cat.codes.to_numpy()
+    counted = (severity_codes < len(SEVERITY_COLUMNS)) & known_status_df['Request ID'].notna().to_numpy()
+    n_groups = pivot_groups.ngroups
+    severity_tally = np.bincount(
+        group_codes[counted] * len(SEVERITY_COLUMNS) + severity_codes[counted],
+        weights=known_status_df['Count'].to_numpy()[counted],
+        minlength=n_groups * len(SEVERITY_COLUMNS)
+    ).astype(np.int64).reshape(n_groups, len(SEVERITY_COLUMNS))
+    pivot_index = pivot_groups.size().index
+    # Order rows by the lifecycle Status order once, using the category codes; the stable sort keeps
+    # Request IDs in order of appearance, and each month's slice below inherits this order
+    status_rank = np.argsort(pivot_index.get_level_values('Status').codes, kind='stable')
+    pivot_all = pd.DataFrame(severity_tally[status_rank], index=pivot_index[status_rank], columns=SEVERITY_COLUMNS)
+    pivot_by_month = {month: month_pivot.droplevel('Period') for month, month_pivot in pivot_all.groupby(level='Period', sort=False, observed=True)}
+    empty_pivot = pivot_all.iloc[:0].droplevel('Period')
+
+    # Alerts per (Period, Status) for the summary metrics, from the same tally
+    status_alerts_all = pivot_all.sum(axis=1).groupby(level=['Period', 'Status'], sort=False, observed=True).sum()
+    status_alerts_by_month = {month: month_alerts.droplevel('Period') for month, month_alerts in status_alerts_all.groupby(level='Period', sort=False, observed=True)}
+    empty_status_alerts = status_alerts_all.iloc[:0].droplevel('Period')
+
+    # Stacked bar chart counts: Request ID x Status x Severity per month, leaving out rows with a missing
+    # Request ID or Status and sorted on the raw values (not the lifecycle/severity category order)
+    chart_all = (
+        base_df.dropna(subset=['Request ID', 'Status'])
+        .astype({'Status': object, 'SeverityName': object})
+        .sort_values(['Request ID', 'Status', 'SeverityName'], kind='stable')
+    )
+    chart_columns = ['Request ID', 'Status', 'SeverityName', 'Count']
+    chart_by_month = {month: month_chart[chart_columns] for month, month_chart in chart_all.groupby('Period', sort=False, observed=True)}
+    empty_chart = chart_all[chart_columns].iloc[:0]
 
     # ============================================
     # Process each month separately
     # ============================================
-    for month in ticket_df['Month'].unique():
-        month_df = ticket_df[ticket_df['Month'] == month].copy()
+    for month, month_df in ticket_df.groupby('Period', sort=False, observed=True):
         month_safe = month.replace(' ', '_').replace(',', '')
 
         # ============================================
@@ -136,34 +193,9 @@ def generate_ticket_lifecycle_analysis(ticket_df: pd.DataFrame, num_months: int)
         # Rows: Grouped by Status, then Request ID
         # Columns: Critical, High, Medium, Low
         # ============================================
-
-        # Create the pivot table with Request ID and Status as multi-index
-        pivot_data = []
-
-        # Group by Status first, then by Request ID within each status
-        for status in ['closed', 'in_progress', 'open', 'pending', 'on-hold']:
-            status_df = month_df[month_df['Status'] == status]
-
-            if not status_df.empty:
-                # Get unique Request IDs for this status
-                request_ids = status_df['Request ID'].unique()
-
-                for req_id in request_ids:
-                    req_df = status_df[status_df['Request ID'] == req_id]
-
-                    # Count severity for this Request ID
-                    row_data = {
-                        'Status': format_status_label(status),  # Use display label
-                        'Request ID': req_id,
-                        'Critical': len(req_df[req_df['SeverityName'] == 'Critical']),
-                        'High': len(req_df[req_df['SeverityName'] == 'High']),
-                        'Medium': len(req_df[req_df['SeverityName'] == 'Medium']),
-                        'Low': len(req_df[req_df['SeverityName'] == 'Low'])
-                    }
-                    pivot_data.append(row_data)
-
-        # Create DataFrame
-        pivot_df = pd.DataFrame(pivot_data)
+        # Already grouped by Status first (fixed lifecycle order), then by Request ID within each status
+        pivot_df = pivot_by_month.get(month, empty_pivot).reset_index()
+        pivot_df['Status'] = pivot_df['Status'].astype(object).map(format_status_label)  # Use display label
 
         # Store the pivot table
         results[f'request_severity_pivot_{month_safe}'] = pivot_df
@@ -172,18 +204,21 @@ def generate_ticket_lifecycle_analysis(ticket_df: pd.DataFrame, num_months: int)
         # 2. Ticket Summary Metrics (Section A.2)
         # ============================================
         # Calculate totals from pivot table (sum of all severity counts)
-        severity_columns = ['Critical', 'High', 'Medium', 'Low']
+        severity_columns = SEVERITY_COLUMNS
+
+        # Alert count per status (internal status values), tallied for all months up front
+        status_alerts = status_alerts_by_month.get(month, empty_status_alerts)
 
         # Total alerts = sum of all severity counts across all rows
-        total_alerts = int(pivot_df[severity_columns].sum().sum())
+        total_alerts = int(status_alerts.sum())
 
         # Alerts resolved = sum of all severity counts where Status is 'Closed'
-        closed_df = pivot_df[pivot_df['Status'] == 'Closed']
-        alerts_resolved = int(closed_df[severity_columns].sum().sum())
+        alerts_resolved = int(status_alerts.get('closed', 0))
 
         # Alerts pending = sum of all severity counts where Status is in pending states
-        pending_df = pivot_df[pivot_df['Status'].isin(['Open', 'Pending', 'On-Hold', 'In Progress'])]
-        alerts_pending = int(pending_df[severity_columns].sum().sum())
+        pending_statuses = ['open', 'pending', 'on-hold', 'in_progress']
+        alerts_pending = int(status_alerts[status_alerts.index.isin(pending_statuses)].sum())
+        pending_df = pivot_df[pivot_df['Status'].isin([format_status_label(status) for status in pending_statuses])]
 
         # Generate pending Request IDs string with actual alert counts
         if alerts_pending > 0:
@@ -218,7 +253,8 @@ def generate_ticket_lifecycle_analysis(ticket_df: pd.DataFrame, num_months: int)
         # 3. Chart Data for visualization
         # ============================================
         # Stacked bar chart data: Request ID x Severity
-        chart_data = month_df.groupby(['Request ID', 'Status', 'SeverityName']).size().reset_index(name='Count')
+        # (a month whose rows all lack a Request ID or Status gets an empty chart)
+        chart_data = chart_by_month.get(month, empty_chart).reset_index(drop=True)
         # Apply display labels for Status
         chart_data['Status'] = chart_data['Status'].apply(format_status_label)
         results[f'chart_data_{month_safe}'] = chart_data
@@ -246,48 +282,49 @@ def create_placeholder_ticket_data(months: List[str], custom_counts_per_month: D
         DataFrame with placeholder ticket data
     """
 
-    # Define ticket statuses and severities
-    statuses = ['Open', 'Pending', 'On-hold', 'Closed']
+    # Define ticket severities
     severities = ['Critical', 'High', 'Medium', 'Low']
 
     # Severity distribution weights
     severity_weights = [0.1, 0.3, 0.4, 0.2]  # Critical, High, Medium, Low
 
-    # Create placeholder data
-    data = []
-    ticket_id = 1
+    # Example distribution (default values)
+    default_counts = {
+        'Open': 25,      # Example: 25 open tickets
+        'Pending': 15,   # Example: 15 pending tickets
+        'On-hold': 10,   # Example: 10 on-hold tickets
+        'Closed': 50     # Example: 50 closed tickets
+    }
+
+    # Use custom counts for a specific month if provided, otherwise use defaults
+    month_counts = [
+        custom_counts_per_month[month] if custom_counts_per_month and month in custom_counts_per_month else default_counts
+        for month in months
+    ]
+    month_totals = [sum(ticket_counts.values()) for ticket_counts in month_counts]
+    total_tickets = sum(month_totals)
+    if total_tickets == 0:
+        return pd.DataFrame()
 
     import random
 
-    for month in months:
-        # Use custom counts for this specific month if provided, otherwise use defaults
-        if custom_counts_per_month and month in custom_counts_per_month:
-            ticket_counts = custom_counts_per_month[month]
-        else:
-            # Example distribution (default values)
-            ticket_counts = {
-                'Open': 25,      # Example: 25 open tickets
-                'Pending': 15,   # Example: 15 pending tickets
-                'On-hold': 10,   # Example: 10 on-hold tickets
-                'Closed': 50     # Example: 50 closed tickets
-            }
-
-        # Create records for each status
-        for status, count in ticket_counts.items():
-            for _ in range(count):
-                # Assign severity based on weights
-                severity = random.choices(severities, weights=severity_weights)[0]
-
-                data.append({
-                    'TicketID': f'TKT-{ticket_id:05d}',
-                    'Period': month,
-                    'Status': status,
-                    'SeverityName': severity,  # NEW: Add severity
-                    'Request ID': 500000 + ticket_id,  # NEW: Add Request ID
-                    'CreatedDate': f'{month}-01',  # Placeholder date
-                    'Category': 'Security Incident',  # Placeholder category
-                    'Priority': 'Medium'  # Placeholder priority
-                })
-                ticket_id += 1
-
-    return pd.DataFrame(data)
+    # Build each column for all months at once: expand months and statuses by their counts,
+    # then assign severities based on weights in a single draw
+    period_col = np.repeat(np.array(months, dtype=object), month_totals)
+    status_col = np.repeat(
+        [status for ticket_counts in month_counts for status in ticket_counts],
+        [count for ticket_counts in month_counts for count in ticket_counts.values()]
+    )
+    severity_col = random.choices(severities, weights=severity_weights, k=total_tickets)
+    ticket_ids = np.arange(1, total_tickets + 1)
+
+    return pd.DataFrame({
+        'TicketID': np.char.add('TKT-', np.char.zfill(ticket_ids.astype(str), 5)),
+        'Period': period_col,
+        'Status': status_col,
+        'SeverityName': severity_col,  # NEW: Add severity
+        'Request ID': 500000 + ticket_ids,  # NEW: Add Request ID
+        'CreatedDate': np.char.add(period_col.astype(str), '-01'),  # Placeholder date
+        'Category': 'Security Incident',  # Placeholder category
+        'Priority': 'Medium'  # Placeholder priority
+    })
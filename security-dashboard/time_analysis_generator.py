@@ -13,8 +13,16 @@ With Month column for multi-month support
 
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Day names in report order (Monday = 1, Sunday = 7)
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Hour labels in HH:00 format, indexed by hour (0 -> "0:00", ..., 23 -> "23:00")
+HOUR_LABELS = np.array([f"{h}:00" for h in range(24)], dtype=object)
+
+
 def generate_time_analysis(time_template_df, num_months=1):
     """
     Generate time-based analysis results from template
@@ -50,30 +58,32 @@ def generate_time_analysis(time_template_df, num_months=1):
 
     print(f"[Time Analysis Generator] Using timestamp column: {timestamp_col}")
 
-    # Clean data - use .copy() to avoid SettingWithCopyWarning
-    df = time_template_df.copy()
+    # Clean data - the filtered frame below is copied once, so the input is never modified
+    df = time_template_df
 
     # Debug: Show records before filtering
     print(f"[Time Analysis Generator] Total records before filtering: {len(df)}")
     if has_period:
-        for period in df['Period'].unique():
-            count = len(df[df['Period'] == period])
+        for period, count in df['Period'].value_counts(sort=False).items():
             print(f"[Time Analysis Generator]   - {period}: {count} records")
 
-    df = df[df['UniqueNo'].notna()].copy()
-    print(f"[Time Analysis Generator] Records after UniqueNo filter: {len(df)}")
+    has_unique_no = df['UniqueNo'].notna()
+    print(f"[Time Analysis Generator] Records after UniqueNo filter: {has_unique_no.sum()}")
 
-    # Check timestamp column for empty/null values per period
+    # Check timestamp column for empty/null values per period (one grouped pass over all periods)
     if has_period:
-        for period in df['Period'].unique():
-            period_df = df[df['Period'] == period]
-            non_null_timestamps = period_df[timestamp_col].notna().sum()
-            null_timestamps = period_df[timestamp_col].isna().sum()
-            empty_timestamps = (period_df[timestamp_col] == '').sum()
-            print(f"[Time Analysis Generator]   - {period}: {non_null_timestamps} valid, {null_timestamps} null, {empty_timestamps} empty timestamps")
-
-    df = df[df[timestamp_col].notna()].copy()
-    df = df[df[timestamp_col] != ''].copy()  # Also filter empty strings
+        timestamps = df.loc[has_unique_no, timestamp_col]
+        timestamp_summary = pd.DataFrame({
+            'valid': timestamps.notna(),
+            'null': timestamps.isna(),
+            'empty': timestamps == ''
+        }).groupby(df.loc[has_unique_no, 'Period'], sort=False).sum()
+        for period, valid, null, empty in timestamp_summary.itertuples():
+            print(f"[Time Analysis Generator]   - {period}: {valid} valid, {null} null, {empty} empty timestamps")
+
+    # Keep rows with a UniqueNo and a non-null, non-empty timestamp (one combined mask, one copy)
+    has_timestamp = df[timestamp_col].notna() & (df[timestamp_col] != '')
+    df = df.loc[has_unique_no & has_timestamp].copy()
     print(f"[Time Analysis Generator] Records after timestamp filter: {len(df)}")
 
     # Debug: Show sample timestamps BEFORE parsing
@@ -89,89 +99,103 @@ def generate_time_analysis(time_template_df, num_months=1):
     print(f"[Time Analysis Generator] Parsing timestamps with MIXED format support...")
     print(f"[Time Analysis Generator] Sample timestamps to parse: {df[timestamp_col].head(3).tolist()}")
 
-    # Initialize ParsedDateTime column
-    df['ParsedDateTime'] = pd.NaT
-
-    # Try multiple date formats in order of preference
-    date_formats = [
-        '%Y/%m/%d %I:%M:%S %p',   # 2025/08/10 09:12:52 PM
-        '%d/%m/%Y %I:%M:%S %p',   # 31/07/2025 01:31:09 AM or 21/01/2026 05:16:40 PM
-        '%Y-%m-%d %H:%M:%S',      # 2025-08-10 09:12:52 (24-hour)
-        '%d-%m-%Y %H:%M:%S',      # 10-08-2025 09:12:52 (24-hour)
-        '%Y/%m/%d %H:%M:%S',      # 2025/08/10 09:12:52 (24-hour)
-        '%d/%m/%Y %H:%M:%S',      # 31/07/2025 09:12:52 (24-hour)
-    ]
-
-    for fmt in date_formats:
-        failed_mask = df['ParsedDateTime'].isna()
-        if not failed_mask.any():
-            break  # All parsed successfully
-
-        failed_count = failed_mask.sum()
-        print(f"[Time Analysis Generator] Trying format '{fmt}' for {failed_count} unparsed records...")
-
-        df.loc[failed_mask, 'ParsedDateTime'] = pd.to_datetime(
-            df.loc[failed_mask, timestamp_col],
+    # Alerts fire in bursts that share the same timestamp string, so every parse step below runs
+    # on the distinct timestamps only (written into a plain datetime64 array by boolean indexing).
+    # The results are gathered back onto the rows by code and attached to df as the
+    # ParsedDateTime column once every fallback has run.
+    timestamp_codes, unique_timestamps = pd.factorize(df[timestamp_col])
+    unique_timestamps = pd.Series(unique_timestamps)
+    records_per_timestamp = np.bincount(timestamp_codes, minlength=len(unique_timestamps))
+    parsed_unique = np.full(len(unique_timestamps), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+    # Each supported format has its own layout (year first or day first, '/' or '-' separators,
+    # 12-hour with AM/PM or 24-hour), so a timestamp can only ever match one of them. Classify every
+    # timestamp once, then parse each layout's timestamps with its format in a single pass.
+    timestamp_text = unique_timestamps.astype(str)
+    year_first = timestamp_text.str.match(r'\d{4}')
+    dash_separated = timestamp_text.str.match(r'\d+-')
+    twelve_hour = timestamp_text.str.contains(r'[AP]M$', case=False)
+
+    date_formats = {
+        '%Y/%m/%d %I:%M:%S %p': year_first & ~dash_separated & twelve_hour,     # 2025/08/10 09:12:52 PM
+        '%d/%m/%Y %I:%M:%S %p': ~year_first & ~dash_separated & twelve_hour,    # 31/07/2025 01:31:09 AM or 21/01/2026 05:16:40 PM
+        '%Y-%m-%d %H:%M:%S': year_first & dash_separated & ~twelve_hour,        # 2025-08-10 09:12:52 (24-hour)
+        '%d-%m-%Y %H:%M:%S': ~year_first & dash_separated & ~twelve_hour,       # 10-08-2025 09:12:52 (24-hour)
+        '%Y/%m/%d %H:%M:%S': year_first & ~dash_separated & ~twelve_hour,       # 2025/08/10 09:12:52 (24-hour)
+        '%d/%m/%Y %H:%M:%S': ~year_first & ~dash_separated & ~twelve_hour,      # 31/07/2025 09:12:52 (24-hour)
+    }
+
+    for fmt, layout_mask in date_formats.items():
+        layout_mask = layout_mask.to_numpy()
+        layout_count = records_per_timestamp[layout_mask].sum()
+        if layout_count == 0:
+            continue
+
+        parsed_unique[layout_mask] = pd.to_datetime(
+            timestamp_text[layout_mask],
             errors='coerce',
             format=fmt
-        )
+        ).to_numpy(dtype='datetime64[ns]')
 
-        newly_parsed = failed_count - df['ParsedDateTime'].isna().sum()
-        if newly_parsed > 0:
-            print(f"[Time Analysis Generator] Successfully parsed {newly_parsed} records with format '{fmt}'")
+        parsed_count = records_per_timestamp[layout_mask & ~np.isnat(parsed_unique)].sum()
+        print(f"[Time Analysis Generator] Parsed {parsed_count} of {layout_count} records with format '{fmt}'")
 
     # For any remaining failures, try flexible parsing with dayfirst=True
-    still_failed_mask = df['ParsedDateTime'].isna()
-    still_failed_count = still_failed_mask.sum()
+    still_failed_mask = np.isnat(parsed_unique)
+    still_failed_count = records_per_timestamp[still_failed_mask].sum()
 
     if still_failed_count > 0:
         print(f"[Time Analysis Generator] {still_failed_count} records still failed, trying flexible parsing (dayfirst=True)...")
-        df.loc[still_failed_mask, 'ParsedDateTime'] = pd.to_datetime(
-            df.loc[still_failed_mask, timestamp_col],
+        parsed_unique[still_failed_mask] = pd.to_datetime(
+            unique_timestamps[still_failed_mask],
             errors='coerce',
             dayfirst=True
-        )
+        ).to_numpy(dtype='datetime64[ns]')
 
     # Final fallback: try without dayfirst
-    final_failed_mask = df['ParsedDateTime'].isna()
-    final_failed_count = final_failed_mask.sum()
+    final_failed_mask = np.isnat(parsed_unique)
+    final_failed_count = records_per_timestamp[final_failed_mask].sum()
 
     if final_failed_count > 0:
         print(f"[Time Analysis Generator] {final_failed_count} records still failed, trying flexible parsing (dayfirst=False)...")
-        df.loc[final_failed_mask, 'ParsedDateTime'] = pd.to_datetime(
-            df.loc[final_failed_mask, timestamp_col],
+        parsed_unique[final_failed_mask] = pd.to_datetime(
+            unique_timestamps[final_failed_mask],
             errors='coerce',
             dayfirst=False
-        )
+        ).to_numpy(dtype='datetime64[ns]')
+
+    parsed_datetime = parsed_unique[timestamp_codes]
 
     # Debug: Check final failure count
-    final_null_count = df['ParsedDateTime'].isna().sum()
+    failed_mask = np.isnat(parsed_datetime)
+    final_null_count = failed_mask.sum()
     if final_null_count > 0:
         print(f"[Time Analysis Generator] WARNING: {final_null_count} records failed ALL parsing attempts")
-        failed_samples = df[df['ParsedDateTime'].isna()][timestamp_col].head(5).tolist()
+        failed_samples = df.loc[failed_mask, timestamp_col].head(5).tolist()
         print(f"[Time Analysis Generator] Sample failed timestamps: {failed_samples}")
 
         # FALLBACK: Use Period column for failed records if available
         if 'Period' in df.columns:
-            failed_mask = df['ParsedDateTime'].isna()
-            print(f"[Time Analysis Generator] Using Period column as fallback for {failed_mask.sum()} records...")
-
-            # For failed records, create a dummy datetime from Period (first day of month)
-            for idx in df[failed_mask].index:
-                period = df.loc[idx, 'Period']
-                if pd.notna(period):
-                    try:
-                        # Parse "January 2026" format
-                        dummy_date = pd.to_datetime(f"1 {period}", format='%d %B %Y')
-                        df.loc[idx, 'ParsedDateTime'] = dummy_date
-                    except:
-                        pass
-
-            recovered = failed_mask.sum() - df['ParsedDateTime'].isna().sum()
+            print(f"[Time Analysis Generator] Using Period column as fallback for {final_null_count} records...")
+
+            # For failed records, create a dummy datetime from Period (first day of month);
+            # each distinct Period (e.g. "January 2026") is parsed once and mapped onto the rows
+            failed_periods = df.loc[failed_mask, 'Period']
+            period_dates = {
+                period: pd.to_datetime(f"1 {period}", format='%d %B %Y', errors='coerce')
+                for period in failed_periods.dropna().unique()
+            }
+            parsed_datetime[failed_mask] = pd.to_datetime(
+                failed_periods.map(period_dates)
+            ).to_numpy(dtype='datetime64[ns]')
+
+            recovered = final_null_count - np.isnat(parsed_datetime).sum()
             print(f"[Time Analysis Generator] Recovered {recovered} records using Period fallback")
     else:
         print(f"[Time Analysis Generator] SUCCESS: All {len(df)} timestamps parsed successfully!")
 
+    df['ParsedDateTime'] = parsed_datetime
+
     # Show unique months detected BEFORE filtering
     df_temp = df[df['ParsedDateTime'].notna()].copy()
     df_temp['_TempMonth'] = df_temp['ParsedDateTime'].dt.strftime('%B %Y')
@@ -184,14 +208,23 @@ def generate_time_analysis(time_template_df, num_months=1):
     print(f"[Time Analysis Generator] Sample parsed dates (first 10):")
     print(df['ParsedDateTime'].head(10).tolist())
 
-    # Extract time components
-    df['Date'] = df['ParsedDateTime'].dt.date
-    df['Hour'] = df['ParsedDateTime'].dt.hour
-    df['DayOfWeek'] = df['ParsedDateTime'].dt.day_name()
-    df['DayOfWeekNum'] = df['ParsedDateTime'].dt.dayofweek  # 0=Monday, 6=Sunday
+    # Extract time components with datetime64 arithmetic on the underlying array, rather than a
+    # separate .dt accessor pass (and a per-element strftime for Month) for each component
+    parsed = df['ParsedDateTime'].to_numpy()
+    parsed_days = parsed.astype('datetime64[D]')
+    day_of_week = (parsed_days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday; 0=Monday, 6=Sunday
 
-    # Extract Month from ParsedDateTime (format: "June 2025", "July 2025", etc.)
-    df['Month'] = df['ParsedDateTime'].dt.strftime('%B %Y')
+    df['Date'] = parsed_days  # datetime64 day, not Python date objects
+    df['Hour'] = ((parsed - parsed_days) // np.timedelta64(1, 'h')).astype(np.int8)
+    df['DayOfWeek'] = pd.Categorical.from_codes(day_of_week, categories=DAY_ORDER, ordered=True)
+    df['DayOfWeekNum'] = day_of_week.astype(np.int8)
+
+    # Extract Month (format: "June 2025", "July 2025", etc.) as an ordered Categorical in
+    # chronological order; only the distinct months are formatted, and the generators
+    # group and sort on its integer codes
+    unique_month_starts, month_codes = np.unique(parsed.astype('datetime64[M]'), return_inverse=True)
+    month_labels = pd.DatetimeIndex(unique_month_starts).strftime('%B %Y')
+    df['Month'] = pd.Categorical.from_codes(month_codes.reshape(-1), categories=month_labels, ordered=True)
 
     # Debug: Show unique months detected
     unique_months_detected = df['Month'].unique()
@@ -209,13 +242,21 @@ def generate_time_analysis(time_template_df, num_months=1):
             print(f"[Time Analysis Generator] Filtered out {removed} record(s) with dates outside expected month range (valid: {unique_periods_set})")
         print(f"[Time Analysis Generator] Months after period filter: {df['Month'].unique().tolist()}")
 
-    # Generate all analysis results
-    results = {
-        'daily_trends': generate_daily_trends(df, num_months),
-        'hourly_analysis': generate_hourly_analysis(df, num_months),
-        'day_of_week': generate_day_of_week_analysis(df, num_months),
-        'raw_data': df  # Include raw data for pivot table builder
-    }
+    # Generate all analysis results. The three generators only read df and build
+    # independent outputs, so they run side by side (groupby/sort release the GIL)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            'daily_trends': executor.submit(generate_daily_trends, df, num_months),
+            'hourly_analysis': executor.submit(generate_hourly_analysis, df, num_months),
+            'day_of_week': executor.submit(generate_day_of_week_analysis, df, num_months),
+        }
+        results = {key: future.result() for key, future in futures.items()}
+
+    # Include raw data for pivot table builder, projected to the identifying and derived time
+    # columns so the rest of the (possibly wide) template isn't kept alive with the results
+    raw_columns = ['UniqueNo', timestamp_col] + (['Period'] if has_period else []) + \
+                  ['ParsedDateTime', 'Date', 'Hour', 'DayOfWeek', 'DayOfWeekNum', 'Month']
+    results['raw_data'] = df[raw_columns]
 
     print(f"[Time Analysis Generator] Generated {len(results)} analysis outputs")
 
@@ -234,50 +275,24 @@ def generate_daily_trends(df, num_months):
     """
 
     # Group by Date and Month
-    daily_counts = df.groupby(['Date', 'Month']).size().reset_index(name='Detection Count')
-
-    # Add temporary column for date sorting and month sorting
-    daily_counts['_DateSort'] = pd.to_datetime(daily_counts['Date'])
-
-    # Create month sort order (January 2025 = 0, February 2025 = 1, etc.)
-    month_order = {'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
-                   'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12}
+    daily_counts = df.groupby(['Date', 'Month'], observed=True).size().reset_index(name='Detection Count')
 
-    def get_month_sort_key(month_str):
-        # Extract month name and year from "July 2025" format
-        parts = month_str.split()
-        if len(parts) == 2:
-            month_name, year = parts
-            return int(year) * 100 + month_order.get(month_name, 99)
-        return 999999
-
-    daily_counts['_MonthSort'] = daily_counts['Month'].apply(get_month_sort_key)
+    # Calculate Cumulative sum PER MONTH (in chronological date order)
+    daily_counts = daily_counts.sort_values(['Month', 'Date'])
+    daily_counts['Cumulative'] = daily_counts.groupby('Month', sort=False, observed=True)['Detection Count'].cumsum()
 
     # IMPORTANT SORTING ORDER for Daily Trends:
     # 1. Month (chronological: June -> July -> August)
     # 2. Detection Count (descending: Highest -> Lowest within each month)
     # 3. Date (chronological as tiebreaker)
-    daily_counts = daily_counts.sort_values(['_MonthSort', 'Detection Count', '_DateSort'],
-                                           ascending=[True, False, True])
-
-    # Calculate Cumulative sum PER MONTH (in chronological date order)
-    # Need to re-sort by date within each month for cumulative calculation
-    temp_df = daily_counts.copy()
-    temp_df = temp_df.sort_values(['_MonthSort', '_DateSort'])
-    temp_df['Cumulative'] = temp_df.groupby('Month')['Detection Count'].cumsum()
-
-    # Merge cumulative back to the Detection Count sorted dataframe
-    daily_counts = daily_counts.merge(
-        temp_df[['Date', 'Month', 'Cumulative']],
-        on=['Date', 'Month'],
-        how='left'
-    )
+    daily_counts = daily_counts.sort_values(['Month', 'Detection Count', 'Date'],
+                                           ascending=[True, False, True], ignore_index=True)
 
     # Format Date as string (e.g., "Tue Jun 03 2025")
-    daily_counts['Date'] = daily_counts['_DateSort'].dt.strftime('%a %b %d %Y')
+    daily_counts['Date'] = daily_counts['Date'].dt.strftime('%a %b %d %Y')
 
-    # Drop temporary sorting columns
-    daily_counts = daily_counts.drop(columns=['_DateSort', '_MonthSort'])
+    # Return Month as plain labels
+    daily_counts['Month'] = daily_counts['Month'].astype(str)
 
     # Reorder columns: Date, Detection Count, Cumulative, Month
     daily_counts = daily_counts[['Date', 'Detection Count', 'Cumulative', 'Month']]
@@ -294,7 +309,7 @@ def generate_hourly_analysis(df, num_months):
     SOP Field Names (C.2 Hourly Analysis):
     - Hour: Hour in HH:00 format (0:00 to 23:00)
     - Detection Count: Number of detections in this hour
-    - Percentage: Percentage of total detections (per month)
+    - Percentage: Percentage of total detections (per month), numeric with 1 decimal
     - Period: Business Hours / Non-Business Hours
     - Sort: Numeric sorting (1-24 for hours 0:00-23:00)
     - Month: Month name (for multi-month support)
@@ -305,70 +320,39 @@ def generate_hourly_analysis(df, num_months):
     # Get all unique months in the data
     unique_months = df['Month'].unique()
 
-    # Create a complete template with ALL 24 hours for EACH month
-    all_hours = list(range(0, 24))  # 0 to 23
-    template_data = []
-
-    for month in unique_months:
-        for hour in all_hours:
-            template_data.append({
-                'Hour_Num': hour,
-                'Month': month
-            })
-
-    # Create template dataframe with all hour-month combinations
-    template_df = pd.DataFrame(template_data)
-
-    # Group actual data by Hour and Month
-    hourly_counts = df.groupby(['Hour', 'Month']).size().reset_index(name='Detection Count')
-    hourly_counts = hourly_counts.rename(columns={'Hour': 'Hour_Num'})
-
-    # Merge template with actual data (left join to keep all 24 hours)
-    hourly_complete = template_df.merge(hourly_counts, on=['Hour_Num', 'Month'], how='left')
-
-    # Fill missing detection counts with 0
-    hourly_complete['Detection Count'] = hourly_complete['Detection Count'].fillna(0).astype(int)
-
-    # Calculate percentage PER MONTH
-    total_per_month = hourly_complete.groupby('Month')['Detection Count'].transform('sum')
+    # Count actual data by Month and Hour, then reindex onto ALL 24 hours for EACH month
+    # (hour-month combinations without detections are filled with 0)
+    hourly_counts = df.groupby(['Month', 'Hour'], observed=True).size()
+    full_index = pd.MultiIndex.from_product([unique_months, range(24)], names=['Month', 'Hour'])
+    hourly_complete = (hourly_counts.reindex(full_index, fill_value=0)
+                       .rename('Detection Count')
+                       .reset_index()
+                       .rename(columns={'Hour': 'Hour_Num'})
+                       .astype({'Hour_Num': 'int64'}))  # dt.hour is int32; keep Sort as int64
+
+    # Calculate percentage PER MONTH (one total per month category, gathered by the row's month code)
+    monthly_totals = hourly_complete.groupby('Month', observed=False)['Detection Count'].sum()
+    total_per_month = monthly_totals.to_numpy()[hourly_complete['Month'].cat.codes.to_numpy()]
     hourly_complete['Percentage'] = (hourly_complete['Detection Count'] / total_per_month * 100).round(1)
-    hourly_complete['Percentage'] = hourly_complete['Percentage'].astype(str) + '%'
 
     # Add Period column (Business Hours: 8:00-17:59, Non-Business Hours: 18:00-7:59)
-    def classify_period(hour):
-        if 8 <= hour < 18:
-            return 'Business Hours'
-        else:
-            return 'Non-Business Hours'
-
-    hourly_complete['Period'] = hourly_complete['Hour_Num'].apply(classify_period)
+    business_hours = hourly_complete['Hour_Num'].between(8, 17)
+    hourly_complete['Period'] = np.where(business_hours, 'Business Hours', 'Non-Business Hours')
 
     # Add Sort column (1-24 for ordering: 0:00=1, 1:00=2, ..., 23:00=24)
     hourly_complete['Sort'] = hourly_complete['Hour_Num'] + 1
 
     # Format Hour as HH:00 format (e.g., "0:00", "1:00", "23:00")
-    hourly_complete['Hour'] = hourly_complete['Hour_Num'].apply(lambda h: f"{h}:00")
-
-    # Create month sort order
-    month_order = {'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
-                   'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12}
-
-    def get_month_sort_key(month_str):
-        parts = month_str.split()
-        if len(parts) == 2:
-            month_name, year = parts
-            return int(year) * 100 + month_order.get(month_name, 99)
-        return 999999
-
-    hourly_complete['_MonthSort'] = hourly_complete['Month'].apply(get_month_sort_key)
+    hourly_complete['Hour'] = HOUR_LABELS[hourly_complete['Hour_Num'].to_numpy()]
 
     # IMPORTANT SORTING ORDER for Hourly Analysis:
     # 1st: Month (chronological: June -> July -> August)
     # 2nd: Sort/Hour (chronological: 0:00 -> 23:00)
-    hourly_complete = hourly_complete.sort_values(['_MonthSort', 'Sort'])
+    hourly_complete = hourly_complete.sort_values(['Month', 'Sort'])
 
-    # Drop temporary columns
-    hourly_complete = hourly_complete.drop(columns=['_MonthSort', 'Hour_Num'])
+    # Drop temporary column and return Month as plain labels
+    hourly_complete = hourly_complete.drop(columns=['Hour_Num'])
+    hourly_complete['Month'] = hourly_complete['Month'].astype(str)
 
     # Reorder columns: Hour, Detection Count, Percentage, Period, Sort, Month
     hourly_complete = hourly_complete[['Hour', 'Detection Count', 'Percentage', 'Period', 'Sort', 'Month']]
@@ -386,7 +370,7 @@ def generate_day_of_week_analysis(df, num_months):
     SOP Field Names (C.3 Day of Week Analysis):
     - Day: Day name (Monday, Tuesday, ..., Sunday)
     - Detection Count: Number of detections on this day of week
-    - Percentage: Percentage of total detections (per month)
+    - Percentage: Percentage of total detections (per month), numeric with 1 decimal
     - Type: Weekday / Weekend
     - Sort: Numeric sorting (1-7 for Monday-Sunday)
     - Month: Month name (for multi-month support)
@@ -394,51 +378,33 @@ def generate_day_of_week_analysis(df, num_months):
     IMPORTANT: Shows ALL 7 days (Monday-Sunday) even if Detection Count = 0
     """
 
-    # Define day order for sorting (Monday = 1, Sunday = 7)
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    day_sort_map = {day: idx + 1 for idx, day in enumerate(day_order)}
+    # Day order for sorting (Monday = 1, Sunday = 7)
+    day_sort_map = {day: idx + 1 for idx, day in enumerate(DAY_ORDER)}
 
     # Get all unique months in the data
     unique_months = df['Month'].unique()
 
-    # Create a complete template with ALL 7 days for EACH month
-    template_data = []
-    for month in unique_months:
-        for day in day_order:
-            template_data.append({
-                'DayOfWeek': day,
-                'Month': month
-            })
-
-    # Create template dataframe with all day-month combinations
-    template_df = pd.DataFrame(template_data)
-
-    # Group actual data by DayOfWeek and Month
-    dow_counts = df.groupby(['DayOfWeek', 'Month']).size().reset_index(name='Detection Count')
-
-    # Merge template with actual data (left join to keep all 7 days)
-    dow_complete = template_df.merge(dow_counts, on=['DayOfWeek', 'Month'], how='left')
-
-    # Fill missing detection counts with 0
-    dow_complete['Detection Count'] = dow_complete['Detection Count'].fillna(0).astype(int)
-
-    # Calculate percentage PER MONTH
-    total_per_month = dow_complete.groupby('Month')['Detection Count'].transform('sum')
-    # Avoid division by zero
-    dow_complete['Percentage'] = dow_complete.apply(
-        lambda row: 0.0 if total_per_month[row.name] == 0 else (row['Detection Count'] / total_per_month[row.name] * 100),
-        axis=1
+    # Count actual data by Month and DayOfWeek, then reindex onto ALL 7 days for EACH month
+    # (day-month combinations without detections are filled with 0)
+    dow_counts = df.groupby(['Month', 'DayOfWeek'], observed=True).size()
+    full_index = pd.MultiIndex.from_product([unique_months, DAY_ORDER], names=['Month', 'DayOfWeek'])
+    dow_complete = (dow_counts.reindex(full_index, fill_value=0)
+                    .rename('Detection Count')
+                    .reset_index()
+                    .astype({'DayOfWeek': str}))
+
+    # Calculate percentage PER MONTH (one total per month category, gathered by the row's month code)
+    monthly_totals = dow_complete.groupby('Month', observed=False)['Detection Count'].sum()
+    totals = monthly_totals.to_numpy()[dow_complete['Month'].cat.codes.to_numpy()]
+    # Avoid division by zero (months with no detections get 0.0%)
+    counts = dow_complete['Detection Count'].to_numpy()
+    dow_complete['Percentage'] = np.where(
+        totals == 0, 0.0, counts / np.where(totals == 0, 1, totals) * 100
     ).round(1)
-    dow_complete['Percentage'] = dow_complete['Percentage'].astype(str) + '%'
 
     # Add Type column (Weekday / Weekend)
-    def classify_type(day):
-        if day in ['Saturday', 'Sunday']:
-            return 'Weekend'
-        else:
-            return 'Weekday'
-
-    dow_complete['Type'] = dow_complete['DayOfWeek'].apply(classify_type)
+    weekend = dow_complete['DayOfWeek'].isin(['Saturday', 'Sunday'])
+    dow_complete['Type'] = np.where(weekend, 'Weekend', 'Weekday')
 
     # Add Sort column (Monday=1, Tuesday=2, ..., Sunday=7)
     dow_complete['Sort'] = dow_complete['DayOfWeek'].map(day_sort_map)
@@ -446,26 +412,13 @@ def generate_day_of_week_analysis(df, num_months):
     # Rename DayOfWeek to Day
     dow_complete = dow_complete.rename(columns={'DayOfWeek': 'Day'})
 
-    # Create month sort order
-    month_order = {'January': 1, 'February': 2, 'March': 3, 'April': 4, 'May': 5, 'June': 6,
-                   'July': 7, 'August': 8, 'September': 9, 'October': 10, 'November': 11, 'December': 12}
-
-    def get_month_sort_key(month_str):
-        parts = month_str.split()
-        if len(parts) == 2:
-            month_name, year = parts
-            return int(year) * 100 + month_order.get(month_name, 99)
-        return 999999
-
-    dow_complete['_MonthSort'] = dow_complete['Month'].apply(get_month_sort_key)
-
     # IMPORTANT SORTING ORDER for Day of Week Analysis:
     # 1st: Month (chronological: June -> July -> August)
     # 2nd: Day (Monday -> Sunday using Sort column)
-    dow_complete = dow_complete.sort_values(['_MonthSort', 'Sort'])
+    dow_complete = dow_complete.sort_values(['Month', 'Sort'])
 
-    # Drop temporary sort column
-    dow_complete = dow_complete.drop(columns=['_MonthSort'])
+    # Return Month as plain labels
+    dow_complete['Month'] = dow_complete['Month'].astype(str)
 
     # Reorder columns: Day, Detection Count, Percentage, Type, Sort, Month
     dow_complete = dow_complete[['Day', 'Detection Count', 'Percentage', 'Type', 'Sort', 'Month']]
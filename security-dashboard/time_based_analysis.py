@@ -9,11 +9,16 @@ from theme_utils import setup_theme
 import datetime
 import calendar
 from datetime import datetime, timedelta
+from io import StringIO
+import csv
 import re
+from collections import defaultdict
 
-def centered_table_css():
-    """Return CSS for centering values in Streamlit tables"""
-    return """
+# Day names indexed by day of week (0=Monday, 6=Sunday)
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], dtype=object)
+
+# CSS for centering values in Streamlit tables, defined once and reused on every rerun
+_CENTERED_TABLE_CSS = """
     <style>
     table {
         width: 100%;
@@ -146,80 +151,284 @@ def centered_table_css():
     </style>
     """
 
-def preprocess_weekly_data(detection_data):
-    """Process weekly data in a safer way"""
+# Definition and use case cards shown above each chart when definitions are enabled
+_DEFINITION_CARDS = {
+    'daily': """
+    <div class="definition-card">
+        <h4>Daily Detection Trend</h4>
+        <p><strong>Definition:</strong> Shows the number of security detections per day over time with a 7-day moving average.</p>
+        <p><strong>Use Case:</strong> Identify trends and anomalies in detection volume, which may correlate with security events or changes in the environment.</p>
+    </div>
+    """,
+    'hourly': """
+    <div class="definition-card">
+        <h4>Detection Distribution by Hour of Day</h4>
+        <p><strong>Definition:</strong> Shows the distribution of detections across the 24 hours of the day.</p>
+        <p><strong>Use Case:</strong> Identify the hours with highest security activity, which helps in optimizing security monitoring schedules.</p>
+    </div>
+    """,
+    'day_of_week': """
+    <div class="definition-card">
+        <h4>Detection Distribution by Day of Week</h4>
+        <p><strong>Definition:</strong> Shows the distribution of detections across the days of the week.</p>
+        <p><strong>Use Case:</strong> Identify patterns in security activity across different days, which may indicate specific vulnerabilities or attack patterns.</p>
+    </div>
+    """,
+    'weekly': """
+    <div class="definition-card">
+        <h4>Week-over-Week Detection Comparison</h4>
+        <p><strong>Definition:</strong> Shows detection counts for each week and the percentage change compared to the previous week.</p>
+        <p><strong>Use Case:</strong> Track how security incidents evolve over time and identify significant changes that may require investigation.</p>
+    </div>
+    """,
+}
+
+# Temporal insight card templates, filled in with str.format on each render
+_BUSINESS_HOURS_CARD = """
+    <div class="insight-card">
+        <h4>Business Hours vs. Non-Business Hours</h4>
+        <p>{business_hours_pct}% of detections occur during business hours (9:00-17:00).</p>
+        <p>Peak detection hour is {peak_hour}:00.</p>
+    </div>
+    """
+
+_WEEKDAY_CARD = """
+    <div class="insight-card">
+        <h4>Weekday vs. Weekend</h4>
+        <p>{weekday_pct}% of detections occur on weekdays.</p>
+        <p>{day_name} has the highest detection count ({day_count} detections).</p>
+    </div>
+    """
+
+_RECENT_TREND_CARD = """
+    <div class="insight-card">
+        <h4>Recent Trend Observations</h4>
+        <p>{recent_trend_text}</p>
+        <p>{highest_detection_text}</p>
+    </div>
+    """
+
+def centered_table_css():
+    """Return CSS for centering values in Streamlit tables"""
+    return _CENTERED_TABLE_CSS
+
+def _parse_dates_cached(series, parse_unique):
+    """Parse a timestamp column once per distinct value and gather the results back onto the rows"""
+    # Detections from many hosts share the same minute-resolution timestamp, so parse_unique
+    # only sees the distinct values (as a Series)
+    codes, unique_values = pd.factorize(series)
+    parsed = pd.to_datetime(parse_unique(pd.Series(unique_values))).to_numpy(dtype='datetime64[ns]')
+    # Code -1 (missing value) picks up the trailing NaT
+    parsed = np.append(parsed, np.datetime64('NaT', 'ns'))
+    return pd.Series(parsed[codes], index=series.index, name=series.name)
+
+def preprocess_weekly_data(detection_times):
+    """Process weekly data in a safer way from the parsed detection timestamps"""
     # Return empty dataframe if no data
-    if detection_data.empty:
+    if detection_times.empty:
         return pd.DataFrame({'Week_Num': [1], 'Count': [0], 'WoW_Change': [0.0]})
     
-    # Extract weeks
-    if 'Detect MALAYSIA TIME FORMULA' in detection_data.columns:
-        try:
-            # Make sure dates are parsed properly
-            if not pd.api.types.is_datetime64_dtype(detection_data['Detect MALAYSIA TIME FORMULA']):
-                detection_data['Detect MALAYSIA TIME FORMULA'] = pd.to_datetime(
-                    detection_data['Detect MALAYSIA TIME FORMULA'], 
-                    errors='coerce'
-                )
-            
-            # Extract week number
-            detection_data['Week'] = detection_data['Detect MALAYSIA TIME FORMULA'].dt.isocalendar().week
-            
-            # Handle missing values
-            detection_data = detection_data.dropna(subset=['Week'])
-            
-            # If no data left after dropping NA, return empty frame
-            if len(detection_data) == 0:
-                return pd.DataFrame({'Week_Num': [1], 'Count': [0], 'WoW_Change': [0.0]})
-            
-            # Adjust week numbers to relative (Week 1, 2, 3, 4)
-            min_week = detection_data['Week'].min()
-            detection_data['Week_Num'] = detection_data['Week'] - min_week + 1
-            
-            # Get weekly counts using value_counts instead of groupby
-            week_counts = detection_data['Week_Num'].value_counts().sort_index()
-            
-            # Convert to dataframe with explicit index
-            weekly_df = pd.DataFrame({'Week_Num': week_counts.index, 'Count': week_counts.values})
-            
-            # Ensure all weeks are represented
-            max_week = int(weekly_df['Week_Num'].max())
-            all_weeks = list(range(1, max_week + 1))
-            complete_weeks = pd.DataFrame({'Week_Num': all_weeks})
-            weekly_df = complete_weeks.merge(weekly_df, on='Week_Num', how='left').fillna(0)
-            weekly_df['Count'] = weekly_df['Count'].astype(int)
-            
-            # Calculate changes
-            changes = []
-            for i in range(len(weekly_df)):
-                if i == 0:
-                    changes.append(0.0)
-                else:
-                    prev = weekly_df.iloc[i-1]['Count']
-                    curr = weekly_df.iloc[i]['Count']
-                    if prev > 0:
-                        changes.append(((curr - prev) / prev * 100))
-                    else:
-                        changes.append(0.0)
-            
-            weekly_df['WoW_Change'] = changes
-            return weekly_df
-        except Exception as e:
-            # If any error occurs, return empty dataframe
-            print(f"Error in weekly data preprocessing: {e}")
+    try:
+        # Extract week number (0 marks an unparsed timestamp, ISO weeks start at 1)
+        weeks = detection_times.dt.isocalendar().week.to_numpy(dtype=np.int64, na_value=0)
+        weeks = weeks[weeks > 0]
+        
+        # If no data left after dropping NA, return empty frame
+        if weeks.size == 0:
             return pd.DataFrame({'Week_Num': [1], 'Count': [0], 'WoW_Change': [0.0]})
-    else:
-        # No date column available
+        
+        # Count weeks relative to the first one (Week 1, 2, 3, 4); bincount keeps weeks with no detections
+        counts = np.bincount(weeks - weeks.min())
+        weekly_df = pd.DataFrame({'Week_Num': np.arange(1, counts.size + 1), 'Count': counts})
+        
+        # Calculate changes (0.0 for the first week and after a week with no detections)
+        prev = weekly_df['Count'].shift(1)
+        weekly_df['WoW_Change'] = np.where(prev > 0, (weekly_df['Count'] - prev) / prev * 100.0, 0.0)
+        return weekly_df
+    except Exception as e:
+        # If any error occurs, return empty dataframe
+        print(f"Error in weekly data preprocessing: {e}")
         return pd.DataFrame({'Week_Num': [1], 'Count': [0], 'WoW_Change': [0.0]})
 
+# Known detection time layouts, tried in order
+DETECTION_TIME_FORMATS = [
+    '%d/%m/%Y %H:%M',  # 28/2/2025 15:03
+    '%Y/%m/%d %H:%M:%S',  # 2025/02/28 15:03:00
+    '%d/%m/%Y %I:%M:%S %p',  # 28/2/2025 03:03:00 PM
+    '%Y-%m-%d %H:%M:%S',  # 2025-02-28 15:03:00
+    '%d-%m-%Y %H:%M',  # 28-02-2025 15:03
+    '%Y/%m/%d %I:%M:%S %p',  # 2025/02/28 03:03:00 PM
+]
+
+def parse_datetime_flexible(values):
+    """Try multiple datetime formats on a Series of timestamps"""
+    text = values.astype(str).str.strip()
+    parsed = np.full(len(text), np.datetime64('NaT'), dtype='datetime64[ns]')
+    remaining = np.array(text != '', dtype=bool)
+
+    # Each known format is one vectorized parse over the values no earlier format matched
+    for fmt in DETECTION_TIME_FORMATS:
+        if not remaining.any():
+            break
+        parsed[remaining] = pd.to_datetime(text[remaining], format=fmt, errors='coerce').to_numpy(dtype='datetime64[ns]')
+        remaining &= np.isnat(parsed)
+
+    # If no format works, try pandas flexible parsing value by value
+    for i in np.flatnonzero(remaining):
+        try:
+            parsed[i] = pd.to_datetime(text.iloc[i]).to_datetime64()
+        except (ValueError, TypeError):
+            pass
+
+    return parsed
+
+# Helper function to turn the pasted detection text into every table and metric the dashboard
+# shows; cached on the text (last 8 inputs), so regenerating with unchanged data skips the parsing and grouping
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_time_dashboard_data(detection_data_input):
+    # Convert text input to DataFrame (all fields kept as text, Hostname read straight into a
+    # categorical for the unique host count; rows with more or fewer fields than the header are skipped;
+    # quote characters are ordinary text, as with a plain tab split)
+    lines = detection_data_input.strip().split('\n')
+    field_tabs = lines[0].count('\t')
+    detection_text = '\n'.join([lines[0]] + [line for line in lines[1:] if line.count('\t') == field_tabs])
+    detection_data = pd.read_csv(
+        StringIO(detection_text),
+        sep='\t',
+        quoting=csv.QUOTE_NONE,
+        dtype=defaultdict(lambda: str, Hostname='category'),
+        keep_default_na=False
+    )
+
+    # Apply flexible parsing (once per distinct timestamp)
+    detection_data['Detect MALAYSIA TIME FORMULA'] = _parse_dates_cached(
+        detection_data['Detect MALAYSIA TIME FORMULA'],
+        parse_datetime_flexible
+    )
+
+    # Extract date and time components for analysis with datetime64 arithmetic on one
+    # array (unparsed timestamps stay missing in every component)
+    timestamps = detection_data['Detect MALAYSIA TIME FORMULA'].to_numpy(dtype='datetime64[ns]')
+    days = timestamps.astype('datetime64[D]')
+    day_of_week = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday; 0=Monday
+    parsed = pd.Series(~np.isnat(timestamps), index=detection_data.index)
+    detection_data['Hour'] = pd.Series(timestamps.astype('datetime64[h]').astype(np.int64) % 24, index=detection_data.index).where(parsed)
+    detection_data['Day_of_Week'] = pd.Series(day_of_week, index=detection_data.index).where(parsed)
+
+    # Basic statistics for dashboard
+    total_detections = len(detection_data)
+    unique_hosts = detection_data['Hostname'].nunique()
+
+    # Determine date range for the report
+    if total_detections > 0:
+        min_date = detection_data['Detect MALAYSIA TIME FORMULA'].min().date()
+        max_date = detection_data['Detect MALAYSIA TIME FORMULA'].max().date()
+        date_range = (max_date - min_date).days + 1
+    else:
+        min_date = datetime.now().date()
+        max_date = datetime.now().date()
+        date_range = 1
+
+    # Daily detection counts over every day in the period (days with zero detections included)
+    all_dates = pd.date_range(start=min_date, end=max_date)
+    daily_counts = (pd.Series(days.astype('datetime64[ns]')).value_counts(sort=False)
+                    .reindex(all_dates, fill_value=0)
+                    .rename_axis('Date').reset_index(name='Count'))
+
+    # Calculate 7-day moving average from a running total (shorter windows for the first 6 days)
+    counts = daily_counts['Count'].to_numpy(dtype=np.float64)
+    running_total = np.concatenate(([0.0], np.cumsum(counts)))
+    day_idx = np.arange(len(counts))
+    window_start = np.maximum(day_idx - 6, 0)
+    daily_counts['Moving_Avg'] = (running_total[day_idx + 1] - running_total[window_start]) / (day_idx - window_start + 1)
+
+    # Hour of day analysis, completed to all hours (0-23)
+    hourly_counts = (detection_data['Hour'].value_counts(sort=False)
+                     .reindex(range(0, 24), fill_value=0)
+                     .rename_axis('Hour').reset_index(name='Count'))
+
+    # Peak hour from the completed hourly counts (handles empty data gracefully)
+    if total_detections > 0:
+        peak_hour = int(hourly_counts['Hour'].iat[np.argmax(hourly_counts['Count'].to_numpy())])
+    else:
+        peak_hour = 0
+
+    # Day of week analysis, completed to all days of week
+    # (Day_Name follows from Day_of_Week, so only the day number is counted)
+    day_counts = (detection_data['Day_of_Week'].value_counts(sort=False)
+                  .reindex(range(0, 7), fill_value=0)
+                  .rename_axis('Day_of_Week').reset_index(name='Count'))
+    day_counts.insert(1, 'Day_Name', DAY_NAMES)
+
+    # Add percentage to day counts
+    total_day_count = day_counts['Count'].sum()
+    if total_day_count > 0:
+        day_counts['Percentage'] = (day_counts['Count'] / total_day_count * 100).round(1)
+    else:
+        day_counts['Percentage'] = 0.0
+
+    # Weekly analysis using the preprocessing function (timestamps are already parsed above)
+    weekly_counts = preprocess_weekly_data(detection_data['Detect MALAYSIA TIME FORMULA'])
+
+    # Business hours vs. non-business hours
+    business_hours_count = int(detection_data['Hour'].between(9, 16).sum())  # 9am-5pm (9-16 inclusive)
+    business_hours_pct = round(business_hours_count / total_detections * 100, 1) if total_detections > 0 else 0.0
+
+    # Weekday vs. weekend
+    weekday_count = int((detection_data['Day_of_Week'] < 5).sum())  # Monday-Friday
+    weekday_pct = round(weekday_count / total_detections * 100, 1) if total_detections > 0 else 0.0
+
+    # Week-over-week table exactly as displayed ("Week N" labels, int32 counts, signed one-decimal
+    # percentages, "0.0%" when unchanged)
+    wow_values = weekly_counts['WoW_Change'].to_numpy()
+    wow_table = pd.DataFrame({
+        'Week': 'Week ' + weekly_counts['Week_Num'].astype(str),
+        'Count': weekly_counts['Count'].astype(np.int32),
+        'WoW_Change': np.where(
+            wow_values == 0, '0.0%',
+            np.char.add(np.where(wow_values > 0, '+', ''), np.char.mod('%.1f%%', wow_values))
+        )
+    })
+
+    # Highest detection day, shown in the daily key insight and the recent trend card
+    daily_totals = daily_counts['Count'].to_numpy()
+    highest_day_idx = int(np.argmax(daily_totals)) if daily_totals.size > 0 else 0
+    highest_day_count = int(daily_totals[highest_day_idx]) if daily_totals.size > 0 else 0
+    highest_day_date = daily_counts['Date'].iat[highest_day_idx].strftime('%d/%m/%Y') if daily_totals.size > 0 else ''
+
+    # Peak week, peak day of week and latest week's change for the executive summary
+    # (weekly_counts always has at least one week and day_counts all seven days)
+    week_totals = weekly_counts['Count'].to_numpy()
+    peak_week_idx = int(np.argmax(week_totals))
+    day_totals = day_counts['Count'].to_numpy()
+    peak_day_idx = int(np.argmax(day_totals))
+    latest_week_change = float(wow_values[-1]) if len(wow_values) > 1 else 0.0
+
+    return {
+        'total_detections': total_detections,
+        'unique_hosts': unique_hosts,
+        'peak_hour': peak_hour,
+        'daily_counts': daily_counts,
+        'hourly_counts': hourly_counts,
+        'day_counts': day_counts,
+        'weekly_counts': weekly_counts,
+        'wow_table': wow_table,
+        'business_hours_pct': business_hours_pct,
+        'weekday_pct': weekday_pct,
+        'highest_day_date': highest_day_date,
+        'highest_day_count': highest_day_count,
+        'peak_week_num': int(weekly_counts['Week_Num'].iat[peak_week_idx]),
+        'peak_week_count': int(week_totals[peak_week_idx]),
+        'peak_day_name': day_counts['Day_Name'].iat[peak_day_idx],
+        'peak_day_count': int(day_totals[peak_day_idx]),
+        'latest_week_change': latest_week_change
+    }
+
 def time_based_analysis_dashboard():
     # Apply the current theme
     plt_style = setup_theme()
     plt.style.use(plt_style)
     
-    # Apply centered table CSS
-    st.markdown(centered_table_css(), unsafe_allow_html=True)
-    
     # ========== SIDEBAR CONFIGURATION ==========
     with st.sidebar:
         st.title("🔧 Time-Based Analysis Settings")
@@ -315,510 +524,334 @@ def time_based_analysis_dashboard():
     
     # ========== MAIN DASHBOARD AREA ==========
     
-    # Title with report period
-    st.markdown(f"<h1 class='dashboard-title'>Time-Based Security Analysis Dashboard - {report_period}</h1>", unsafe_allow_html=True)
+    # Centered table CSS and title with report period, emitted together
+    st.markdown(_CENTERED_TABLE_CSS + f"<h1 class='dashboard-title'>Time-Based Security Analysis Dashboard - {report_period}</h1>", unsafe_allow_html=True)
     
     # Process data and generate dashboard
     if generate_dashboard:
+        # Only the data processing is guarded; rendering runs outside the try
         try:
-            # Convert text input to DataFrame
-            lines = detection_data_input.strip().split('\n')
-            headers = lines[0].split('\t')
-            
-            rows = []
-            for line in lines[1:]:
-                values = line.split('\t')
-                if len(values) == len(headers):
-                    rows.append(values)
-            
-            detection_data = pd.DataFrame(rows, columns=headers)
-            
-            # Parse detection time with multiple format attempts
-            def parse_datetime_flexible(date_str):
-                """Try multiple datetime formats"""
-                if pd.isna(date_str) or str(date_str).strip() == '':
-                    return pd.NaT
-
-                date_str = str(date_str).strip()
-
-                # Try different formats
-                formats = [
-                    '%d/%m/%Y %H:%M',  # 28/2/2025 15:03
-                    '%Y/%m/%d %H:%M:%S',  # 2025/02/28 15:03:00
-                    '%d/%m/%Y %I:%M:%S %p',  # 28/2/2025 03:03:00 PM
-                    '%Y-%m-%d %H:%M:%S',  # 2025-02-28 15:03:00
-                    '%d-%m-%Y %H:%M',  # 28-02-2025 15:03
-                    '%Y/%m/%d %I:%M:%S %p',  # 2025/02/28 03:03:00 PM
-                ]
-
-                for fmt in formats:
-                    try:
-                        return pd.to_datetime(date_str, format=fmt)
-                    except (ValueError, TypeError):
-                        continue
-
-                # If no format works, try pandas flexible parsing
-                try:
-                    return pd.to_datetime(date_str)
-                except (ValueError, TypeError):
-                    return pd.NaT
-
-            # Apply flexible parsing
-            detection_data['Detect MALAYSIA TIME FORMULA'] = detection_data['Detect MALAYSIA TIME FORMULA'].apply(parse_datetime_flexible)
-            
-            # Extract date and time components for analysis
-            detection_data['Date'] = detection_data['Detect MALAYSIA TIME FORMULA'].dt.date
-            detection_data['Hour'] = detection_data['Detect MALAYSIA TIME FORMULA'].dt.hour
-            detection_data['Day_of_Week'] = detection_data['Detect MALAYSIA TIME FORMULA'].dt.dayofweek
-            detection_data['Day_Name'] = detection_data['Detect MALAYSIA TIME FORMULA'].dt.day_name()
-            
-            st.success("✅ Data processed successfully!")
-            
-            # Basic statistics for dashboard
-            total_detections = len(detection_data)
-            unique_hosts = detection_data['Hostname'].nunique()
-            
-            # Handle empty data gracefully
-            if total_detections > 0:
-                peak_hour = detection_data.groupby('Hour').size().idxmax()
-            else:
-                peak_hour = 0
+            time_data = build_time_dashboard_data(detection_data_input)
+        except Exception as e:
+            st.error(f"❌ Error processing data: {e}")
+            st.error("Please check your data format and try again.")
+            return
+
+        st.success("✅ Data processed successfully!")
+
+        total_detections = time_data['total_detections']
+        unique_hosts = time_data['unique_hosts']
+        peak_hour = time_data['peak_hour']
+        daily_counts = time_data['daily_counts']
+        hourly_counts = time_data['hourly_counts']
+        day_counts = time_data['day_counts']
+        weekly_counts = time_data['weekly_counts']
+        business_hours_pct = time_data['business_hours_pct']
+        weekday_pct = time_data['weekday_pct']
+        wow_table = time_data['wow_table']
+        highest_day_date = time_data['highest_day_date']
+        highest_day_count = time_data['highest_day_count']
+        
+        # Display dashboard
+        st.markdown("<h2 class='section-header'>📊 Temporal Detection Patterns</h2>", unsafe_allow_html=True)
+        
+        # Metrics display
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Total Detections", f"{total_detections:,}")
+        
+        with col2:
+            st.metric("Unique Hosts", f"{unique_hosts:,}")
             
-            # Determine date range for the report
-            if total_detections > 0:
-                min_date = detection_data['Detect MALAYSIA TIME FORMULA'].min().date()
-                max_date = detection_data['Detect MALAYSIA TIME FORMULA'].max().date()
-                date_range = (max_date - min_date).days + 1
-            else:
-                min_date = datetime.now().date()
-                max_date = datetime.now().date()
-                date_range = 1
-            
-            # Create a date range for all days in the period
-            all_dates = pd.date_range(start=min_date, end=max_date)
-            all_dates_df = pd.DataFrame({'Date': all_dates.date})
-            
-            # Daily detection counts
-            daily_counts = detection_data.groupby('Date').size().reset_index(name='Count')
-            
-            # Merge with all dates to include days with zero detections
-            daily_counts = pd.merge(all_dates_df, daily_counts, on='Date', how='left').fillna(0)
-            daily_counts['Count'] = daily_counts['Count'].astype(int)
-            
-            # Calculate 7-day moving average
-            daily_counts['Moving_Avg'] = daily_counts['Count'].rolling(window=7, min_periods=1).mean()
-            
-            # Hour of day analysis
-            hourly_counts = detection_data.groupby('Hour').size().reset_index(name='Count')
-            hourly_counts = hourly_counts.sort_values('Hour')
-            
-            # Complete the hours (0-23)
-            all_hours = pd.DataFrame({'Hour': range(0, 24)})
-            hourly_counts = pd.merge(all_hours, hourly_counts, on='Hour', how='left').fillna(0)
-            hourly_counts['Count'] = hourly_counts['Count'].astype(int)
-            
-            # Day of week analysis
-            day_counts = detection_data.groupby(['Day_of_Week', 'Day_Name']).size().reset_index(name='Count')
-            day_counts = day_counts.sort_values('Day_of_Week')
-            
-            # Complete all days of week
-            all_days = pd.DataFrame({
-                'Day_of_Week': range(0, 7),
-                'Day_Name': ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            })
-            day_counts = pd.merge(all_days, day_counts, on=['Day_of_Week', 'Day_Name'], how='left').fillna(0)
-            day_counts['Count'] = day_counts['Count'].astype(int)
-            
-            # Add percentage to day counts
-            total_day_count = day_counts['Count'].sum()
-            if total_day_count > 0:
-                day_counts['Percentage'] = (day_counts['Count'] / total_day_count * 100).round(1)
-            else:
-                day_counts['Percentage'] = 0.0
-            
-            # Weekly analysis using the preprocessing function
-            weekly_counts = preprocess_weekly_data(detection_data)
-            
-            # Business hours vs. non-business hours
-            business_hours_data = detection_data[detection_data['Hour'].between(9, 16)]  # 9am-5pm (9-16 inclusive)
-            business_hours_count = len(business_hours_data)
-            business_hours_pct = round(business_hours_count / total_detections * 100, 1) if total_detections > 0 else 0.0
-            
-            # Weekday vs. weekend
-            weekday_data = detection_data[detection_data['Day_of_Week'] < 5]  # Monday-Friday
-            weekday_count = len(weekday_data)
-            weekday_pct = round(weekday_count / total_detections * 100, 1) if total_detections > 0 else 0.0
-            
-            # Display dashboard
-            st.markdown("<h2 class='section-header'>📊 Temporal Detection Patterns</h2>", unsafe_allow_html=True)
-            
-            # Metrics display
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Total Detections", f"{total_detections:,}")
-            
-            with col2:
-                st.metric("Unique Hosts", f"{unique_hosts:,}")
-                
-            with col3:
-                st.metric("Peak Detection Hour", f"{peak_hour}:00")
-            
-            # 1. Daily Detection Trend visualization
-            if show_definitions:
-                st.markdown("""
-                <div class="definition-card">
-                    <h4>Daily Detection Trend</h4>
-                    <p><strong>Definition:</strong> Shows the number of security detections per day over time with a 7-day moving average.</p>
-                    <p><strong>Use Case:</strong> Identify trends and anomalies in detection volume, which may correlate with security events or changes in the environment.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown(f"<h3>📈 Daily Detection Trend - {report_period}</h3>", unsafe_allow_html=True)
-            
-            if not daily_counts.empty:
-                # Create a plotly figure for daily trend
-                daily_trend_fig = go.Figure()
-                
-                # Add the daily detection counts
-                daily_trend_fig.add_trace(go.Scatter(
-                    x=daily_counts.index,
-                    y=daily_counts['Count'],
-                    mode='lines+markers',
-                    name='Daily Detections',
-                    line=dict(color=daily_trend_color, width=2),
-                    marker=dict(size=8)
-                ))
-                
-                # Add the 7-day moving average
-                daily_trend_fig.add_trace(go.Scatter(
-                    x=daily_counts.index,
-                    y=daily_counts['Moving_Avg'],
-                    mode='lines',
-                    name='7-Day Moving Avg',
-                    line=dict(color=moving_avg_color, width=2, dash='dash')
-                ))
-                
-                # Update layout
-                daily_trend_fig.update_layout(
-                    title='Daily Detection Trend',
-                    xaxis_title='Day of Month',
-                    yaxis_title='Number of Detections',
-                    legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
-                    height=400,
-                    margin=dict(l=40, r=40, t=40, b=40),
-                    hovermode='x unified'
-                )
-                
-                # Show grid if requested
-                if show_grid:
-                    daily_trend_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                    daily_trend_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                
-                # Display the plot
-                st.plotly_chart(daily_trend_fig, use_container_width=True)
-                
-                # Key insight
-                max_day_idx = daily_counts['Count'].idxmax()
-                max_day_count = daily_counts['Count'].max()
-                max_day_date = daily_counts.iloc[max_day_idx]['Date'].strftime('%d/%m/%Y')
-                st.info(f"💡 **Key Insight:** The highest detection day was {max_day_date} with {max_day_count} detections.")
-            else:
-                st.info("No daily trend data available to display.")
-            
-            # 2. Hour of Day visualization
-            if show_definitions:
-                st.markdown("""
-                <div class="definition-card">
-                    <h4>Detection Distribution by Hour of Day</h4>
-                    <p><strong>Definition:</strong> Shows the distribution of detections across the 24 hours of the day.</p>
-                    <p><strong>Use Case:</strong> Identify the hours with highest security activity, which helps in optimizing security monitoring schedules.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("<h3>🕐 Detection Distribution by Hour of Day</h3>", unsafe_allow_html=True)
-            
-            if not hourly_counts.empty:
-                # Create color coding for business hours vs. non-business hours
-                hour_colors = []
-                for hour in hourly_counts['Hour']:
-                    if 9 <= hour < 17:  # Business hours
-                        hour_colors.append('#3498db')  # Blue for business hours
-                    else:
-                        hour_colors.append('#2ecc71')  # Green for non-business hours
-                
-                # Create a plotly figure for hourly distribution
-                hourly_fig = go.Figure()
-                
-                hourly_fig.add_trace(go.Bar(
-                    x=hourly_counts['Hour'],
-                    y=hourly_counts['Count'],
-                    marker_color=hour_colors,
-                    text=hourly_counts['Count'] if show_values else None,
-                    textposition='outside'
-                ))
-                
-                # Update layout
-                hourly_fig.update_layout(
-                    title='Detection Distribution by Hour of Day',
-                    xaxis_title='Hour of Day (24-Hour Format)',
-                    yaxis_title='Number of Detections',
-                    height=500,
-                    margin=dict(l=40, r=40, t=40, b=40),
-                    xaxis=dict(tickmode='array', tickvals=list(range(0, 24)))
-                )
-                
-                # Show grid if requested
-                if show_grid:
-                    hourly_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                    hourly_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                
-                # Display the plot
-                st.plotly_chart(hourly_fig, use_container_width=True)
-                
-                # Key insight
-                st.info(f"💡 **Key Insight:** Peak detection hour is {peak_hour}:00. {business_hours_pct}% of detections occur during business hours (9:00-17:00).")
-            else:
-                st.info("No hourly distribution data available to display.")
-            
-            # 3. Day of Week visualization
-            if show_definitions:
-                st.markdown("""
-                <div class="definition-card">
-                    <h4>Detection Distribution by Day of Week</h4>
-                    <p><strong>Definition:</strong> Shows the distribution of detections across the days of the week.</p>
-                    <p><strong>Use Case:</strong> Identify patterns in security activity across different days, which may indicate specific vulnerabilities or attack patterns.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("<h3>📅 Detection Distribution by Day of Week</h3>", unsafe_allow_html=True)
-            
-            if not day_counts.empty and day_counts['Count'].sum() > 0:
-                # Create color coding for weekdays vs. weekends
-                day_colors = []
-                for day in day_counts['Day_of_Week']:
-                    if day < 5:  # Weekdays (Monday-Friday)
-                        day_colors.append(weekday_color)  # Purple for weekdays
-                    else:
-                        day_colors.append(weekend_color)  # Red for weekends
-                
-                # Create a plotly figure for day of week distribution
-                day_fig = go.Figure()
-                
-                # Create text labels with percentages if requested
-                if show_percentages and show_values:
-                    text_labels = [f"{count} ({pct}%)" for count, pct in zip(day_counts['Count'], day_counts['Percentage'])]
-                elif show_percentages:
-                    text_labels = [f"({pct}%)" for pct in day_counts['Percentage']]
-                elif show_values:
-                    text_labels = day_counts['Count']
-                else:
-                    text_labels = None
-                
-                day_fig.add_trace(go.Bar(
-                    x=day_counts['Day_Name'],
-                    y=day_counts['Count'],
-                    marker_color=day_colors,
-                    text=text_labels,
-                    textposition='outside'
-                ))
-                
-                # Update layout
-                day_fig.update_layout(
-                    title='Detection Distribution by Day of Week',
-                    xaxis_title='Day of Week',
-                    yaxis_title='Number of Detections',
-                    height=500,
-                    margin=dict(l=40, r=40, t=40, b=40)
-                )
-                
-                # Show grid if requested
-                if show_grid:
-                    day_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                    day_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                
-                # Display the plot
-                st.plotly_chart(day_fig, use_container_width=True)
-                
-                # Key insight
-                peak_day_name = day_counts.iloc[day_counts['Count'].idxmax()]['Day_Name']
-                peak_day_count = day_counts['Count'].max()
-                st.info(f"💡 **Key Insight:** {peak_day_name} has the highest detection count ({peak_day_count} detections). {weekday_pct}% of detections occur on weekdays.")
-            else:
-                st.info("No day of week distribution data available to display.")
-            
-            # 4. Week-over-Week Comparison
-            if show_definitions:
-                st.markdown("""
-                <div class="definition-card">
-                    <h4>Week-over-Week Detection Comparison</h4>
-                    <p><strong>Definition:</strong> Shows detection counts for each week and the percentage change compared to the previous week.</p>
-                    <p><strong>Use Case:</strong> Track how security incidents evolve over time and identify significant changes that may require investigation.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("<h3>📊 Week-over-Week Detection Comparison</h3>", unsafe_allow_html=True)
-            
-            if not weekly_counts.empty and weekly_counts['Count'].sum() > 0:
-                # Create a plotly figure for week-over-week comparison
-                wow_fig = go.Figure()
-                
-                # Create the bar chart
-                wow_fig.add_trace(go.Bar(
-                    x=[f'Week {int(week)}' for week in weekly_counts['Week_Num']],
-                    y=weekly_counts['Count'],
-                    marker_color=weekly_comp_color,
-                    text=weekly_counts['Count'] if show_values else None,
-                    textposition='outside'
-                ))
-                
-                # Add week-over-week change annotations if requested
-                if show_annotations:
-                    for i, row in weekly_counts.iterrows():
-                        if i > 0 and row['WoW_Change'] != 0:  # Skip first week and zero changes
-                            wow_fig.add_annotation(
-                                x=i,
-                                y=row['Count'] + max(5, row['Count'] * 0.08),  # Position above the bar
-                                text=f"{'+' if row['WoW_Change'] > 0 else ''}{row['WoW_Change']:.1f}%",
-                                showarrow=False,
-                                font=dict(
-                                    size=12,
-                                    color='green' if row['WoW_Change'] > 0 else 'red'
-                                )
-                            )
-                
-                # Update layout
-                wow_fig.update_layout(
-                    title='Week-over-Week Detection Comparison',
-                    xaxis_title='Week',
-                    yaxis_title='Number of Detections',
-                    height=500,
-                    margin=dict(l=40, r=40, t=40, b=60)
-                )
-                
-                # Show grid if requested
-                if show_grid:
-                    wow_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                    wow_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-                
-                # Display the plot
-                st.plotly_chart(wow_fig, use_container_width=True)
-                
-                # Key insight
-                latest_week = weekly_counts.iloc[-1]
-                latest_week_change = latest_week['WoW_Change']
-                change_direction = 'increase' if latest_week_change >= 0 else 'decrease'
-                st.info(f"💡 **Key Insight:** The most recent week showed a {latest_week_change:.1f}% {change_direction} compared to the previous week.")
-                
-                # Add a table with details
-                st.markdown("<h4>📋 Week-over-Week Changes</h4>", unsafe_allow_html=True)
-                
-                # Format the table data
-                wow_table = weekly_counts.copy()
-                wow_table['Week'] = [f'Week {int(w)}' for w in wow_table['Week_Num']]
-                wow_table['WoW_Change'] = wow_table['WoW_Change'].apply(
-                    lambda x: f"{'+' if x > 0 else ''}{x:.1f}%" if x != 0 else "0.0%"
-                )
-                
-                # Display the table
-                st.dataframe(wow_table[['Week', 'Count', 'WoW_Change']], use_container_width=True)
+        with col3:
+            st.metric("Peak Detection Hour", f"{peak_hour}:00")
+        
+        # 1. Daily Detection Trend visualization
+        # Definition card (when enabled) and chart header in one element
+        st.markdown((_DEFINITION_CARDS['daily'] if show_definitions else '') + f"<h3>📈 Daily Detection Trend - {report_period}</h3>", unsafe_allow_html=True)
+        
+        if not daily_counts.empty:
+            # Create a plotly figure for daily trend
+            daily_trend_fig = go.Figure()
+            day_positions = daily_counts.index.to_numpy()  # shared x for both traces
+            
+            # Add the daily detection counts
+            daily_trend_fig.add_trace(go.Scatter(
+                x=day_positions,
+                y=daily_counts['Count'].to_numpy(),
+                mode='lines+markers',
+                name='Daily Detections',
+                line=dict(color=daily_trend_color, width=2),
+                marker=dict(size=8)
+            ))
+            
+            # Add the 7-day moving average
+            daily_trend_fig.add_trace(go.Scatter(
+                x=day_positions,
+                y=daily_counts['Moving_Avg'].to_numpy(),
+                mode='lines',
+                name='7-Day Moving Avg',
+                line=dict(color=moving_avg_color, width=2, dash='dash')
+            ))
+            
+            # Update layout
+            daily_trend_fig.update_layout(
+                title='Daily Detection Trend',
+                xaxis_title='Day of Month',
+                yaxis_title='Number of Detections',
+                legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+                height=400,
+                margin=dict(l=40, r=40, t=40, b=40),
+                hovermode='x unified'
+            )
+            
+            # Show grid if requested
+            if show_grid:
+                daily_trend_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+                daily_trend_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+            
+            # Display the plot
+            st.plotly_chart(daily_trend_fig, use_container_width=True)
+            
+            # Key insight
+            st.info(f"💡 **Key Insight:** The highest detection day was {highest_day_date} with {highest_day_count} detections.")
+        else:
+            st.info("No daily trend data available to display.")
+        
+        # 2. Hour of Day visualization
+        # Definition card (when enabled) and chart header in one element
+        st.markdown((_DEFINITION_CARDS['hourly'] if show_definitions else '') + "<h3>🕐 Detection Distribution by Hour of Day</h3>", unsafe_allow_html=True)
+        
+        if not hourly_counts.empty:
+            # Create color coding for business hours (blue) vs. non-business hours (green)
+            hours = hourly_counts['Hour'].to_numpy()
+            hour_colors = np.where((hours >= 9) & (hours < 17), '#3498db', '#2ecc71')
+            
+            # Create a plotly figure for hourly distribution
+            hourly_fig = go.Figure()
+            
+            hour_totals = hourly_counts['Count'].to_numpy()
+            hourly_fig.add_trace(go.Bar(
+                x=hours,
+                y=hour_totals,
+                marker_color=hour_colors,
+                text=hour_totals if show_values else None,
+                textposition='outside'
+            ))
+            
+            # Update layout
+            hourly_fig.update_layout(
+                title='Detection Distribution by Hour of Day',
+                xaxis_title='Hour of Day (24-Hour Format)',
+                yaxis_title='Number of Detections',
+                height=500,
+                margin=dict(l=40, r=40, t=40, b=40),
+                xaxis=dict(tickmode='array', tickvals=list(range(0, 24)))
+            )
+            
+            # Show grid if requested
+            if show_grid:
+                hourly_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+                hourly_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+            
+            # Display the plot
+            st.plotly_chart(hourly_fig, use_container_width=True)
+            
+            # Key insight
+            st.info(f"💡 **Key Insight:** Peak detection hour is {peak_hour}:00. {business_hours_pct}% of detections occur during business hours (9:00-17:00).")
+        else:
+            st.info("No hourly distribution data available to display.")
+        
+        # 3. Day of Week visualization
+        # Definition card (when enabled) and chart header in one element
+        st.markdown((_DEFINITION_CARDS['day_of_week'] if show_definitions else '') + "<h3>📅 Detection Distribution by Day of Week</h3>", unsafe_allow_html=True)
+        
+        if not day_counts.empty and day_counts['Count'].sum() > 0:
+            # Create color coding for weekdays (Monday-Friday) vs. weekends
+            day_colors = np.where(day_counts['Day_of_Week'].to_numpy() < 5, weekday_color, weekend_color)
+            
+            # Create a plotly figure for day of week distribution
+            day_fig = go.Figure()
+            
+            # Create text labels with percentages if requested
+            if show_percentages and show_values:
+                text_labels = [f"{count} ({pct}%)" for count, pct in zip(day_counts['Count'], day_counts['Percentage'])]
+            elif show_percentages:
+                text_labels = [f"({pct}%)" for pct in day_counts['Percentage']]
+            elif show_values:
+                text_labels = day_counts['Count']
             else:
-                st.info("No weekly trend data available to display.")
-            
-            # 5. Temporal Insights section
-            st.markdown("<h2 class='section-header'>🔍 Temporal Insights</h2>", unsafe_allow_html=True)
-            
-            # Create two columns for business hours and weekday insights
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"""
-                <div class="insight-card">
-                    <h4>Business Hours vs. Non-Business Hours</h4>
-                    <p>{business_hours_pct}% of detections occur during business hours (9:00-17:00).</p>
-                    <p>Peak detection hour is {peak_hour}:00.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="insight-card">
-                    <h4>Weekday vs. Weekend</h4>
-                    <p>{weekday_pct}% of detections occur on weekdays.</p>
-                    <p>{day_counts.iloc[0]['Day_Name']} has the highest detection count ({day_counts.iloc[0]['Count']} detections).</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Recent trend insights
-            recent_trend_text = ""
-            if len(weekly_counts) > 1:
-                latest_week = weekly_counts.iloc[-1]
-                latest_week_num = int(latest_week['Week_Num'])
-                latest_week_change = latest_week['WoW_Change']
-                change_direction = 'increase' if latest_week_change >= 0 else 'decrease'
-                recent_trend_text = f"Week {latest_week_num} showed a {latest_week_change:.1f}% {change_direction} compared to the previous week."
-            
-            highest_detection_text = ""
-            if not daily_counts.empty and daily_counts['Count'].max() > 0:
-                highest_day_idx = daily_counts['Count'].idxmax()
-                highest_day_date = daily_counts.iloc[highest_day_idx]['Date'].strftime('%d/%m/%Y')
-                highest_day_count = daily_counts['Count'].max()
-                highest_detection_text = f"The highest detection day was {highest_day_date} with {highest_day_count} detections."
-            
-            st.markdown(f"""
-            <div class="insight-card">
-                <h4>Recent Trend Observations</h4>
-                <p>{recent_trend_text}</p>
-                <p>{highest_detection_text}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Generate and update executive summary
-            if not detection_data.empty and total_detections > 0:
-                # Get the week with highest detections
-                peak_week_num = int(weekly_counts.iloc[weekly_counts['Count'].idxmax()]['Week_Num']) if not weekly_counts.empty else 1
-                peak_week_count = weekly_counts['Count'].max() if not weekly_counts.empty else 0
-                
-                # Get highest day of week
-                peak_day_name = day_counts.iloc[day_counts['Count'].idxmax()]['Day_Name'] if not day_counts.empty and day_counts['Count'].max() > 0 else "Monday"
-                peak_day_count = day_counts['Count'].max() if not day_counts.empty else 0
-                
-                # Get latest week's change
-                latest_week_change = weekly_counts.iloc[-1]['WoW_Change'] if len(weekly_counts) > 1 else 0.0
-                
-                # Create summary
-                default_summary = f"""• Time-based analysis of {total_detections} detections during {report_period} reveals several important patterns.
+                text_labels = None
+            
+            day_fig.add_trace(go.Bar(
+                x=day_counts['Day_Name'],
+                y=day_counts['Count'],
+                marker_color=day_colors,
+                text=text_labels,
+                textposition='outside'
+            ))
+            
+            # Update layout
+            day_fig.update_layout(
+                title='Detection Distribution by Day of Week',
+                xaxis_title='Day of Week',
+                yaxis_title='Number of Detections',
+                height=500,
+                margin=dict(l=40, r=40, t=40, b=40)
+            )
+            
+            # Show grid if requested
+            if show_grid:
+                day_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+                day_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+            
+            # Display the plot
+            st.plotly_chart(day_fig, use_container_width=True)
+            
+            # Key insight
+            day_totals = day_counts['Count'].to_numpy()
+            peak_day_idx = int(np.argmax(day_totals))
+            peak_day_name = day_counts['Day_Name'].iat[peak_day_idx]
+            peak_day_count = int(day_totals[peak_day_idx])
+            st.info(f"💡 **Key Insight:** {peak_day_name} has the highest detection count ({peak_day_count} detections). {weekday_pct}% of detections occur on weekdays.")
+        else:
+            st.info("No day of week distribution data available to display.")
+        
+        # 4. Week-over-Week Comparison
+        # Definition card (when enabled) and chart header in one element
+        st.markdown((_DEFINITION_CARDS['weekly'] if show_definitions else '') + "<h3>📊 Week-over-Week Detection Comparison</h3>", unsafe_allow_html=True)
+        
+        if not weekly_counts.empty and weekly_counts['Count'].sum() > 0:
+            # Create a plotly figure for week-over-week comparison
+            wow_fig = go.Figure()
+            
+            # Create the bar chart
+            week_totals = weekly_counts['Count'].to_numpy()
+            wow_fig.add_trace(go.Bar(
+                x=wow_table['Week'].to_numpy(),
+                y=week_totals,
+                marker_color=weekly_comp_color,
+                text=week_totals if show_values else None,
+                textposition='outside'
+            ))
+            
+            # Add week-over-week change annotations if requested
+            if show_annotations:
+                wow_changes = weekly_counts['WoW_Change'].to_numpy()
+                wow_fig.update_layout(annotations=[
+                    dict(
+                        x=i,
+                        y=week_totals[i] + max(5, week_totals[i] * 0.08),  # Position above the bar
+                        text=f"{'+' if wow_changes[i] > 0 else ''}{wow_changes[i]:.1f}%",
+                        showarrow=False,
+                        font=dict(
+                            size=12,
+                            color='green' if wow_changes[i] > 0 else 'red'
+                        )
+                    )
+                    for i in range(1, len(week_totals))
+                    if wow_changes[i] != 0  # Skip first week and zero changes
+                ])
+            
+            # Update layout
+            wow_fig.update_layout(
+                title='Week-over-Week Detection Comparison',
+                xaxis_title='Week',
+                yaxis_title='Number of Detections',
+                height=500,
+                margin=dict(l=40, r=40, t=40, b=60)
+            )
+            
+            # Show grid if requested
+            if show_grid:
+                wow_fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+                wow_fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
+            
+            # Display the plot
+            st.plotly_chart(wow_fig, use_container_width=True)
+            
+            # Key insight
+            latest_week = weekly_counts.iloc[-1]
+            latest_week_change = latest_week['WoW_Change']
+            change_direction = 'increase' if latest_week_change >= 0 else 'decrease'
+            st.info(f"💡 **Key Insight:** The most recent week showed a {latest_week_change:.1f}% {change_direction} compared to the previous week.")
+            
+            # Add a table with details
+            st.markdown("<h4>📋 Week-over-Week Changes</h4>", unsafe_allow_html=True)
+            
+            # Display the table
+            st.dataframe(wow_table, use_container_width=True, hide_index=True)
+        else:
+            st.info("No weekly trend data available to display.")
+        
+        # 5. Temporal Insights section
+        # Recent trend insights
+        recent_trend_text = ""
+        if len(weekly_counts) > 1:
+            latest_week = weekly_counts.iloc[-1]
+            latest_week_num = int(latest_week['Week_Num'])
+            latest_week_change = latest_week['WoW_Change']
+            change_direction = 'increase' if latest_week_change >= 0 else 'decrease'
+            recent_trend_text = f"Week {latest_week_num} showed a {latest_week_change:.1f}% {change_direction} compared to the previous week."
+        
+        highest_detection_text = ""
+        if highest_day_count > 0:
+            highest_detection_text = f"The highest detection day was {highest_day_date} with {highest_day_count} detections."
+        
+        # Peak week, peak day and latest week's change come precomputed with the cached data
+        peak_week_num = time_data['peak_week_num']
+        peak_week_count = time_data['peak_week_count']
+        peak_day_name = time_data['peak_day_name']
+        peak_day_count = time_data['peak_day_count']
+        latest_week_change = time_data['latest_week_change']
+        
+        # Generate the executive summary only when session state has none yet (a user-edited
+        # summary is kept as is)
+        if total_detections > 0 and not st.session_state.executive_summary.strip():
+            # Create summary
+            default_summary = f"""• Time-based analysis of {total_detections} detections during {report_period} reveals several important patterns.
 • Detection volume shows Week {peak_week_num} experiencing the highest activity ({peak_week_count} detections).
 • {business_hours_pct}% of detections occur during business hours (9:00-17:00), with peak activity at {peak_hour}:00.
 • {weekday_pct}% of detections occur on weekdays, with {peak_day_name} showing the highest frequency ({peak_day_count} detections).
 • The most recent week showed a {latest_week_change:.1f}% {'increase' if latest_week_change >= 0 else 'decrease'} in detection volume compared to the previous week.
 • These patterns suggest that security monitoring should be enhanced during {peak_day_name}s around {peak_hour}:00, and that security operations should be appropriately staffed during business hours when most incidents occur."""
-                
-                # Update session state if it's empty
-                if not st.session_state.executive_summary.strip():
-                    st.session_state.executive_summary = default_summary
-            
-            # Executive summary display
-            st.markdown("<h2 class='section-header'>📋 Executive Summary</h2>", unsafe_allow_html=True)
-            
-            # Create and display executive summary in blue container
-            summary_html = f"""
-            <div class="executive-summary-blue">
-                <ul class="summary-bullet">
-                    <li>Time-based analysis of {total_detections} detections during {report_period} reveals several important patterns.</li>
-                    <li>Detection volume shows Week {peak_week_num} experiencing the highest activity ({peak_week_count} detections).</li>
-                    <li>{business_hours_pct}% of detections occur during business hours (9:00-17:00), with peak activity at {peak_hour}:00.</li>
-                    <li>{weekday_pct}% of detections occur on weekdays, with {peak_day_name} showing the highest frequency ({peak_day_count} detections).</li>
-                    <li>The most recent week showed a {latest_week_change:.1f}% {'increase' if latest_week_change >= 0 else 'decrease'} in detection volume compared to the previous week.</li>
-                    <li>These patterns suggest that security monitoring should be enhanced during {peak_day_name}s around {peak_hour}:00.</li>
-                </ul>
-            </div>
-            """
-            st.markdown(summary_html, unsafe_allow_html=True)
-                
-        except Exception as e:
-            st.error(f"❌ Error processing data: {e}")
-            st.error("Please check your data format and try again.")
+            st.session_state.executive_summary = default_summary
+        
+        # Executive summary in blue container
+        summary_html = f"""
+        <div class="executive-summary-blue">
+            <ul class="summary-bullet">
+                <li>Time-based analysis of {total_detections} detections during {report_period} reveals several important patterns.</li>
+                <li>Detection volume shows Week {peak_week_num} experiencing the highest activity ({peak_week_count} detections).</li>
+                <li>{business_hours_pct}% of detections occur during business hours (9:00-17:00), with peak activity at {peak_hour}:00.</li>
+                <li>{weekday_pct}% of detections occur on weekdays, with {peak_day_name} showing the highest frequency ({peak_day_count} detections).</li>
+                <li>The most recent week showed a {latest_week_change:.1f}% {'increase' if latest_week_change >= 0 else 'decrease'} in detection volume compared to the previous week.</li>
+                <li>These patterns suggest that security monitoring should be enhanced during {peak_day_name}s around {peak_hour}:00.</li>
+            </ul>
+        </div>
+        """
+        
+        # Insight cards and executive summary emitted as one markdown element; the business hours
+        # and weekday cards sit side by side in a flex row (in place of two st.columns)
+        insights_html = [
+            "<h2 class='section-header'>🔍 Temporal Insights</h2>",
+            "<div style='display: flex; gap: 1rem;'>",
+            "<div style='flex: 1;'>" + _BUSINESS_HOURS_CARD.format(business_hours_pct=business_hours_pct, peak_hour=peak_hour).strip() + "</div>",
+            "<div style='flex: 1;'>" + _WEEKDAY_CARD.format(
+                weekday_pct=weekday_pct,
+                day_name=day_counts['Day_Name'].iat[0],
+                day_count=day_counts['Count'].iat[0]
+            ).strip() + "</div>",
+            "</div>",
+            _RECENT_TREND_CARD.format(
+                recent_trend_text=recent_trend_text,
+                highest_detection_text=highest_detection_text
+            ).strip(),
+            "<h2 class='section-header'>📋 Executive Summary</h2>",
+            summary_html.strip()
+        ]
+        st.markdown('\n'.join(insights_html), unsafe_allow_html=True)
     else:
         # Initial state - no dashboard generated yet
         st.info("👈 Configure your settings and input data in the sidebar, then click 'Generate Dashboard' to begin.")